@@ -0,0 +1,31 @@
+from functools import lru_cache
+
+from services.transcriber import TranscriberService
+from services.viral import ViralAnalysisService
+from utils.youtube import YouTubeUtils
+
+# Shared services, created on first use (once per worker) and injected into
+# routes with FastAPI's Depends.
+
+@lru_cache()
+def get_transcriber_service() -> TranscriberService:
+    return TranscriberService()
+
+@lru_cache()
+def get_viral_service() -> ViralAnalysisService:
+    return ViralAnalysisService()
+
+@lru_cache()
+def get_youtube_utils() -> YouTubeUtils:
+    return YouTubeUtils()
+
+def reset_services() -> None:
+    """
+    Drop the shared services so the next lifespan builds fresh ones.
+
+    They hold the pooled HTTP client (and asyncio primitives) of the lifespan
+    they were created in, which are closed or unusable once it ends.
+    """
+    get_transcriber_service.cache_clear()
+    get_viral_service.cache_clear()
+    get_youtube_utils.cache_clear()
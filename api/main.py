@@ -3,17 +3,33 @@ from dotenv import load_dotenv
 # untuk memuat environment variables sebelum modul lain diimpor.
 load_dotenv()
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from routers import analyze
+from services.http_pool import get_http_client, aclose_http_client
+from deps import reset_services
 import os
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the shared client (and its TLS context) before the first request
+    # instead of during it
+    get_http_client()
+    yield
+    # Close pooled connections shared by the outbound API clients, and drop
+    # the services holding them so a later lifespan (e.g. another TestClient)
+    # doesn't reuse a closed client
+    await aclose_http_client()
+    reset_services()
+
 app = FastAPI(
     title="Rainative AI API",
     description="AI-powered content analysis and viral prediction API",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # CORS middleware configuration
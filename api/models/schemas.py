@@ -1,7 +1,11 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Dict, Optional, Union
 from datetime import datetime
 
+# Shared config for models the API builds itself: they are never mutated after
+# construction, and unknown keys (e.g. extra fields in Gemini's JSON) are dropped.
+RESPONSE_MODEL_CONFIG = ConfigDict(extra="ignore", frozen=True)
+
 class AnalyzeRequest(BaseModel):
     """Request model for content analysis."""
     youtube_url: Optional[str] = Field(None, description="YouTube video URL to analyze")
@@ -9,6 +13,8 @@ class AnalyzeRequest(BaseModel):
 
 class VideoMetadata(BaseModel):
     """Video metadata information."""
+    model_config = RESPONSE_MODEL_CONFIG
+
     title: str = Field(..., description="Video title")
     duration: int = Field(..., description="Video duration in seconds")
     thumbnail_url: str = Field(..., description="Video thumbnail URL")
@@ -20,11 +26,15 @@ class VideoMetadata(BaseModel):
 
 class TimelineItem(BaseModel):
     """Timeline summary item."""
+    model_config = RESPONSE_MODEL_CONFIG
+
     timestamp: str = Field(..., description="Time range (e.g., '00:00 - 01:00')")
     summary: str = Field(..., description="Summary for this time segment")
 
 class ContentRecommendation(BaseModel):
     """Content recommendation based on analysis."""
+    model_config = RESPONSE_MODEL_CONFIG
+
     title: str = Field(..., description="Recommended content title")
     target_audience: str = Field(..., description="Target audience description")
     content_style: str = Field(..., description="Recommended content style")
@@ -34,6 +44,8 @@ class ContentRecommendation(BaseModel):
 
 class AnalyzeResponse(BaseModel):
     """Response model for content analysis."""
+    model_config = RESPONSE_MODEL_CONFIG
+
     video_metadata: Optional[VideoMetadata] = Field(None, description="Video metadata")
     summary: str = Field(..., description="Overall content summary")
     timeline_summary: Optional[List[TimelineItem]] = Field(None, description="Timeline-based summary")
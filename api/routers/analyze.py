@@ -1,29 +1,58 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from models.schemas import AnalyzeRequest, AnalyzeResponse
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends
+from fastapi.responses import Response, StreamingResponse
+from models.schemas import AnalyzeRequest, AnalyzeResponse, TimelineItem
 from services.gemini_utils import (
     summarize_transcript,
+    summarize_timeline_segments,
     explain_why_viral,
     generate_content_idea,
-    summarize_document
+    generate_full_analysis,
+    summarize_document,
+    DocumentAccessError,
+    is_fallback_recommendation,
+    SUMMARY_FALLBACK,
+    VIRAL_EXPLANATION_FALLBACK
 )
 from services.transcriber import TranscriberService
 from services.viral import ViralAnalysisService
 from utils.youtube import YouTubeUtils
+from utils.cache import LRUCache
+from deps import get_transcriber_service, get_viral_service, get_youtube_utils
+import asyncio
 import logging
-
-# Import specific exceptions for better error handling
-from youtube_transcript_api._errors import NoTranscriptFound, TranscriptsDisabled
+import re
+import orjson
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# Initialize services
-transcriber_service = TranscriberService()
-viral_service = ViralAnalysisService()
-youtube_utils = YouTubeUtils()
+# Maximum number of timeline chunks summarized concurrently
+TIMELINE_MAX_CONCURRENCY = 8
+
+JSON_MEDIA_TYPE = "application/json"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Minimum viral score for each label, highest first
+VIRAL_LABEL_THRESHOLDS = ((80, "Very Viral"), (60, "Moderately Viral"))
 
-@router.post("/analyze", response_model=AnalyzeResponse)
-async def analyze_content(request: AnalyzeRequest, background_tasks: BackgroundTasks):
+# Matches a single whitespace-delimited word in a transcript
+_WORD_RE = re.compile(r"\S+")
+
+# Finished YouTube analyses, keyed by video ID
+ANALYSIS_CACHE_TTL_SECONDS = 3600
+analysis_cache = LRUCache(maxsize=512, ttl=ANALYSIS_CACHE_TTL_SECONDS)
+
+@router.post(
+    "/analyze",
+    responses={200: {"model": AnalyzeResponse}}
+)
+async def analyze_content(
+    request: AnalyzeRequest,
+    background_tasks: BackgroundTasks,
+    transcriber_service: TranscriberService = Depends(get_transcriber_service),
+    viral_service: ViralAnalysisService = Depends(get_viral_service),
+    youtube_utils: YouTubeUtils = Depends(get_youtube_utils)
+):
     """
     Analyze YouTube video content or document for viral potential and generate recommendations.
     """
@@ -34,214 +63,555 @@ async def analyze_content(request: AnalyzeRequest, background_tasks: BackgroundT
                 detail="Either youtube_url or file_path must be provided"
             )
 
-        video_metadata = None
+        # Results only depend on the video when no document is attached
+        cache_key = None
+        if request.youtube_url and not request.file_path:
+            video_id = youtube_utils.extract_video_id(str(request.youtube_url))
+            if video_id:
+                cache_key = f"analyze:v1:{video_id}"
+                cached_body = analysis_cache.get(cache_key)
+                if cached_body is not None:
+                    logger.info(f"Returning cached analysis for video ID: {video_id}")
+                    return Response(content=cached_body, media_type=JSON_MEDIA_TYPE)
+
+        video_metadata, video_transcript, doc_summary = await _collect_sources(
+            request, transcriber_service, youtube_utils
+        )
+
+        # The overall analysis and the timeline don't depend on each other
+        analysis_and_timeline = [
+            _analyze_transcript(
+                doc_summary if doc_summary is not None else video_transcript,
+                video_metadata,
+                viral_service
+            )
+        ]
+        if video_metadata:
+            # The timeline always follows the video, even when a document is analyzed too
+            analysis_and_timeline.append(
+                _generate_timeline_summary(video_transcript, video_metadata.duration)
+            )
+
+        results = await asyncio.gather(*analysis_and_timeline, return_exceptions=True)
+
+        if isinstance(results[0], Exception):
+            raise results[0]
+        analysis, degraded = results[0]
+
         timeline_summary = None
-        doc_summary = None
-        transcript = ""
+        if video_metadata:
+            if isinstance(results[1], Exception):
+                logger.warning(f"Timeline summary generation failed: {results[1]}")
+                timeline_summary, timeline_degraded = [], True
+            else:
+                timeline_summary, timeline_degraded = results[1]
+            degraded = degraded or timeline_degraded
 
-        if request.youtube_url:
-            logger.info(f"Analyzing YouTube content: {request.youtube_url}")
+        # Encoded inline: a full response takes tens of microseconds, less
+        # than a thread hop, and pydantic-core holds the GIL while encoding
+        body = _build_response_body(
+            video_metadata=video_metadata,
+            timeline_summary=timeline_summary,
+            doc_summary=doc_summary,
+            **analysis
+        )
 
-            # Get video metadata
-            try:
-                video_metadata = await youtube_utils.get_video_metadata(str(request.youtube_url))
-                if not video_metadata:
-                    raise HTTPException(
-                        status_code=404, 
-                        detail="Invalid YouTube URL or video metadata not accessible. Please check the URL and try again."
-                    )
-            except Exception as e:
-                logger.error(f"Error getting video metadata: {e}")
-                raise HTTPException(
-                    status_code=404,
-                    detail="Unable to access video information. The video might be private, deleted, or the URL is invalid."
-                )
+        logger.info(f"Analysis completed successfully for: {request.youtube_url or request.file_path}")
+        # A response built from fallbacks would keep being served after the
+        # failure clears, so only complete analyses are cached
+        if cache_key and not degraded:
+            analysis_cache.set(cache_key, body)
+        elif cache_key:
+            logger.info(f"Not caching degraded analysis for: {request.youtube_url}")
+        return Response(content=body, media_type=JSON_MEDIA_TYPE)
 
-            # Get transcript with enhanced error handling
-            try:
-                transcript = await transcriber_service.get_transcript(str(request.youtube_url))
-                
-                if not transcript or len(transcript.strip()) < 50:
-                    raise HTTPException(
-                        status_code=422,
-                        detail="The transcript is too short or empty. Please try a different video with more content."
-                    )
-                    
-            except HTTPException:
-                raise  # Re-raise HTTP exceptions as-is
-            except Exception as e:
-                error_message = str(e).lower()
-                
-                if "no subtitles" in error_message or "no captions" in error_message:
-                    raise HTTPException(
-                        status_code=404,
-                        detail="This video doesn't have subtitles or captions available, and audio transcription failed. Please try a video with subtitles enabled."
-                    )
-                elif "unavailable" in error_message or "private" in error_message:
-                    raise HTTPException(
-                        status_code=404,
-                        detail="This video is not available, private, or has been removed. Please check the URL and try again."
-                    )
-                elif "api key" in error_message or "openai" in error_message:
-                    raise HTTPException(
-                        status_code=503,
-                        detail="Audio transcription service is currently unavailable. Please try a video with existing captions."
-                    )
-                elif "rate limit" in error_message or "quota" in error_message:
-                    raise HTTPException(
-                        status_code=429,
-                        detail="Service temporarily unavailable due to high demand. Please try again in a few minutes."
-                    )
-                else:
-                    logger.error(f"Transcript extraction error: {e}")
-                    raise HTTPException(
-                        status_code=500,
-                        detail=f"Failed to extract video content: {str(e)}"
-                    )
-
-            # Generate timeline summary
-            try:
-                timeline_summary = await _generate_timeline_summary(transcript, video_metadata.duration)
-            except Exception as e:
-                logger.warning(f"Timeline summary generation failed: {e}")
-                timeline_summary = []
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error during analysis: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=500, 
+            detail="An internal server error occurred. Please try again later."
+        )
 
-        # Handle document analysis
-        if request.file_path:
-            logger.info(f"Analyzing document: {request.file_path}")
-            try:
-                doc_summary = await summarize_document(request.file_path)
-                transcript = doc_summary
-            except Exception as e:
-                logger.error(f"Document analysis error: {e}")
-                raise HTTPException(
-                    status_code=500,
-                    detail="Failed to analyze document. Please ensure the file is accessible and in a supported format."
-                )
 
-        # Generate overall summary
-        try:
-            overall_summary = await summarize_transcript(transcript)
-        except Exception as e:
-            logger.error(f"Summary generation error: {e}")
-            overall_summary = "Unable to generate summary at this time."
+@router.post("/analyze/stream")
+async def analyze_content_stream(
+    request: AnalyzeRequest,
+    transcriber_service: TranscriberService = Depends(get_transcriber_service),
+    viral_service: ViralAnalysisService = Depends(get_viral_service),
+    youtube_utils: YouTubeUtils = Depends(get_youtube_utils)
+):
+    """
+    Analyze content like /analyze, streaming results as newline-delimited JSON.
 
-        # Calculate viral score
-        title_for_analysis = video_metadata.title if video_metadata else "Document Analysis"
-        views_for_analysis = video_metadata.view_count if video_metadata else 0
-        likes_for_analysis = video_metadata.like_count if video_metadata else 0
+    Each line is an object with an "event" key:
+    - "video_metadata": the video metadata (null for documents)
+    - "timeline_item": one timeline entry with its "index", sent as soon as it is summarized
+    - "analysis": the remaining AnalyzeResponse fields
+    - "error": sent instead of "analysis" if the analysis fails mid-stream
+    """
+    if not request.youtube_url and not request.file_path:
+        raise HTTPException(
+            status_code=400,
+            detail="Either youtube_url or file_path must be provided"
+        )
 
-        try:
-            viral_score = await viral_service.calculate_viral_score(
-                transcript,
-                title_for_analysis,
-                views_for_analysis,
-                likes_for_analysis
-            )
-        except Exception as e:
-            logger.error(f"Viral score calculation error: {e}")
-            viral_score = 65  # Default moderate score
-
-        # Determine viral label
-        if viral_score >= 80:
-            viral_label = "Very Viral"
-        elif viral_score >= 60:
-            viral_label = "Moderately Viral"
-        else:
-            viral_label = "Low Reach"
+    # Resolve the sources before streaming starts so their errors still map
+    # to proper HTTP status codes
+    try:
+        video_metadata, video_transcript, doc_summary = await _collect_sources(
+            request, transcriber_service, youtube_utils
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error during analysis: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="An internal server error occurred. Please try again later."
+        )
 
-        # Generate viral explanation
-        try:
-            viral_explanation = await explain_why_viral(
-                title_for_analysis,
-                views_for_analysis,
-                likes_for_analysis,
-                overall_summary
-            )
-        except Exception as e:
-            logger.error(f"Viral explanation error: {e}")
-            viral_explanation = "This content shows potential for engagement based on its topic and presentation style."
+    async def event_stream():
+        analysis_task = asyncio.create_task(_analyze_transcript(
+            doc_summary if doc_summary is not None else video_transcript,
+            video_metadata,
+            viral_service
+        ))
 
-        # Generate recommendations
         try:
-            recommendations = await generate_content_idea(
-                "general",
-                overall_summary,
-                viral_explanation
+            yield _encode_event(
+                "video_metadata",
+                data=video_metadata.model_dump(mode="json") if video_metadata else None
             )
+
+            if video_metadata:
+                async for index, item in _stream_timeline_summary(video_transcript, video_metadata.duration):
+                    yield _encode_event("timeline_item", index=index, data=item.model_dump())
+
+            analysis, _ = await analysis_task
+            analysis["recommendations"] = analysis["recommendations"].model_dump(mode="json")
+            yield _encode_event("analysis", data={**analysis, "doc_summary": doc_summary})
+
         except Exception as e:
-            logger.error(f"Recommendations generation error: {e}")
-            # Use fallback from gemini_utils
-            from services.gemini_utils import _create_fallback_recommendation
-            recommendations = _create_fallback_recommendation()
+            logger.error(f"Unexpected error during streamed analysis: {str(e)}", exc_info=True)
+            yield _encode_event("error", detail="An internal server error occurred. Please try again later.")
 
-        # Create response
-        response = AnalyzeResponse(
-            video_metadata=video_metadata,
-            summary=overall_summary,
-            timeline_summary=timeline_summary,
-            viral_score=viral_score,
-            viral_label=viral_label,
-            viral_explanation=viral_explanation,
-            recommendations=recommendations,
-            doc_summary=doc_summary
+        finally:
+            if not analysis_task.done():
+                analysis_task.cancel()
+
+    return StreamingResponse(event_stream(), media_type=NDJSON_MEDIA_TYPE)
+
+
+async def _collect_sources(
+    request: AnalyzeRequest,
+    transcriber_service: TranscriberService,
+    youtube_utils: YouTubeUtils
+):
+    """
+    Fetch the video metadata, video transcript and document summary for a request.
+
+    The sources are independent, so they are fetched concurrently. The first
+    failure cancels the other fetches, so e.g. a missing video doesn't wait
+    for (and pay for) a Whisper transcription. When more than one has failed
+    by then, the error is reported in the order metadata, transcript,
+    document.
+
+    Raises HTTPException with a user-facing message when a source can't be read.
+    """
+    video_metadata = None
+    doc_summary = None
+    transcript = ""
+
+    fetches = []
+    if request.youtube_url:
+        logger.info(f"Analyzing YouTube content: {request.youtube_url}")
+        fetches.append(_fetch_video_metadata(str(request.youtube_url), youtube_utils))
+        fetches.append(_fetch_transcript(str(request.youtube_url), transcriber_service))
+
+    # Handle document analysis
+    if request.file_path:
+        logger.info(f"Analyzing document: {request.file_path}")
+        fetches.append(_fetch_document_summary(request.file_path))
+
+    tasks = [asyncio.create_task(fetch) for fetch in fetches]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    finally:
+        # Also reached when the request itself is cancelled
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    for task in tasks:
+        if not task.cancelled() and task.exception() is not None:
+            raise task.exception()
+
+    results = [task.result() for task in tasks]
+
+    if request.youtube_url:
+        video_metadata, transcript = results[0], results[1]
+    if request.file_path:
+        doc_summary = results[-1]
+
+    return video_metadata, transcript, doc_summary
+
+
+async def _fetch_video_metadata(youtube_url: str, youtube_utils: YouTubeUtils):
+    """Get video metadata, raising HTTPException if it isn't accessible."""
+    try:
+        video_metadata = await youtube_utils.get_video_metadata(youtube_url)
+        if not video_metadata:
+            raise HTTPException(
+                status_code=404,
+                detail="Invalid YouTube URL or video metadata not accessible. Please check the URL and try again."
+            )
+        return video_metadata
+    except Exception as e:
+        logger.error(f"Error getting video metadata: {e}")
+        raise HTTPException(
+            status_code=404,
+            detail="Unable to access video information. The video might be private, deleted, or the URL is invalid."
         )
 
-        logger.info(f"Analysis completed successfully for: {request.youtube_url or request.file_path}")
-        return response
+
+async def _fetch_transcript(youtube_url: str, transcriber_service: TranscriberService) -> str:
+    """Get the video transcript, mapping transcription errors to HTTPException."""
+    try:
+        transcript = await transcriber_service.get_transcript(youtube_url)
+
+        if not transcript or len(transcript.strip()) < 50:
+            raise HTTPException(
+                status_code=422,
+                detail="The transcript is too short or empty. Please try a different video with more content."
+            )
+
+        return transcript
 
     except HTTPException:
-        raise
+        raise  # Re-raise HTTP exceptions as-is
     except Exception as e:
-        logger.error(f"Unexpected error during analysis: {str(e)}", exc_info=True)
+        error_message = str(e).lower()
+
+        if "no subtitles" in error_message or "no captions" in error_message:
+            raise HTTPException(
+                status_code=404,
+                detail="This video doesn't have subtitles or captions available, and audio transcription failed. Please try a video with subtitles enabled."
+            )
+        elif "unavailable" in error_message or "private" in error_message:
+            raise HTTPException(
+                status_code=404,
+                detail="This video is not available, private, or has been removed. Please check the URL and try again."
+            )
+        elif "api key" in error_message or "openai" in error_message:
+            raise HTTPException(
+                status_code=503,
+                detail="Audio transcription service is currently unavailable. Please try a video with existing captions."
+            )
+        elif "rate limit" in error_message or "quota" in error_message:
+            raise HTTPException(
+                status_code=429,
+                detail="Service temporarily unavailable due to high demand. Please try again in a few minutes."
+            )
+        else:
+            logger.error(f"Transcript extraction error: {e}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to extract video content: {str(e)}"
+            )
+
+
+async def _fetch_document_summary(file_path: str) -> str:
+    """Summarize the attached document, raising HTTPException if it can't be read."""
+    try:
+        return await summarize_document(file_path)
+    except DocumentAccessError as e:
+        logger.warning(f"Rejected document path {file_path!r}: {e}")
         raise HTTPException(
-            status_code=500, 
-            detail="An internal server error occurred. Please try again later."
+            status_code=400,
+            detail="Invalid file path. Documents must be inside the upload directory."
+        )
+    except Exception as e:
+        logger.error(f"Document analysis error: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to analyze document. Please ensure the file is accessible and in a supported format."
         )
 
 
-async def _generate_timeline_summary(transcript: str, duration_seconds: int):
-    """Generate timeline summary by breaking transcript into chunks."""
+async def _analyze_transcript(transcript: str, video_metadata, viral_service: ViralAnalysisService):
+    """
+    Produce the summary, viral score/label/explanation and recommendations for a transcript.
+
+    Every step falls back to a default value instead of failing the analysis.
+    Returns (analysis, degraded), where degraded is True if any step fell back.
+    """
+    if video_metadata:
+        title_for_analysis = video_metadata.title
+        views_for_analysis = video_metadata.view_count or 0
+        likes_for_analysis = video_metadata.like_count or 0
+    else:
+        title_for_analysis = "Document Analysis"
+        views_for_analysis = 0
+        likes_for_analysis = 0
+
+    # The Gemini analysis and the viral score don't depend on each other
+    full_analysis, viral_score = await asyncio.gather(
+        generate_full_analysis(
+            title_for_analysis,
+            views_for_analysis,
+            likes_for_analysis,
+            "general",
+            transcript
+        ),
+        viral_service.calculate_viral_score(
+            transcript,
+            title_for_analysis,
+            views_for_analysis,
+            likes_for_analysis
+        ),
+        return_exceptions=True
+    )
+
+    degraded = False
+    if isinstance(viral_score, Exception):
+        logger.error(f"Viral score calculation error: {viral_score}")
+        viral_score = 65  # Default moderate score
+        degraded = True
+
+    # Determine viral label
+    viral_label = next(
+        (label for threshold, label in VIRAL_LABEL_THRESHOLDS if viral_score >= threshold),
+        "Low Reach"
+    )
+
+    if isinstance(full_analysis, Exception):
+        logger.warning(f"Combined Gemini analysis failed, falling back to separate requests: {full_analysis}")
+        overall_summary, viral_explanation, recommendations, steps_degraded = await _analyze_transcript_in_steps(
+            transcript,
+            title_for_analysis,
+            views_for_analysis,
+            likes_for_analysis
+        )
+        degraded = degraded or steps_degraded
+    else:
+        overall_summary = full_analysis["summary"]
+        viral_explanation = full_analysis["viral_explanation"]
+        recommendations = full_analysis["recommendation"]
+
+    analysis = {
+        "summary": overall_summary,
+        "viral_score": viral_score,
+        "viral_label": viral_label,
+        "viral_explanation": viral_explanation,
+        "recommendations": recommendations,
+    }
+    return analysis, degraded
+
+
+async def _analyze_transcript_in_steps(transcript: str, title: str, views: int, likes: int):
+    """
+    Produce the summary, viral explanation and recommendations with one Gemini request each.
+
+    Each step builds on the previous one, so the requests are sequential.
+    Returns (summary, viral_explanation, recommendations, degraded), where
+    degraded is True if any step fell back to a default.
+    """
     try:
-        if not transcript or duration_seconds <= 0:
-            return []
+        overall_summary = await summarize_transcript(transcript)
+    except Exception as e:
+        logger.error(f"Summary generation error: {e}")
+        overall_summary = SUMMARY_FALLBACK
+
+    # Generate viral explanation
+    try:
+        viral_explanation = await explain_why_viral(title, views, likes, overall_summary)
+    except Exception as e:
+        logger.error(f"Viral explanation error: {e}")
+        viral_explanation = VIRAL_EXPLANATION_FALLBACK
+
+    # Generate recommendations
+    try:
+        recommendations = await generate_content_idea(
+            "general",
+            overall_summary,
+            viral_explanation
+        )
+    except Exception as e:
+        logger.error(f"Recommendations generation error: {e}")
+        # Use fallback from gemini_utils
+        from services.gemini_utils import _create_fallback_recommendation
+        recommendations = _create_fallback_recommendation()
+
+    # The Gemini helpers also fall back internally instead of raising
+    degraded = (
+        overall_summary == SUMMARY_FALLBACK
+        or viral_explanation == VIRAL_EXPLANATION_FALLBACK
+        or is_fallback_recommendation(recommendations)
+    )
+    return overall_summary, viral_explanation, recommendations, degraded
+
+
+def _build_response_body(**fields) -> bytes:
+    """
+    Assemble the AnalyzeResponse and encode it to JSON bytes in one step.
+
+    Every field was produced (and, where external, validated) by our own
+    services, so the nested models are not re-validated, and pydantic-core
+    encodes straight to JSON without going through jsonable_encoder.
+    """
+    return AnalyzeResponse.model_construct(**fields).model_dump_json().encode()
+
+
+def _encode_event(event: str, **fields) -> bytes:
+    """Encode one line of the /analyze/stream NDJSON response."""
+    return orjson.dumps({"event": event, **fields}, option=orjson.OPT_APPEND_NEWLINE)
+
 
-        words = transcript.split()
-        if len(words) < 10:  # Too short for meaningful timeline
-            return []
+async def _generate_timeline_summary(transcript: str, duration_seconds: int):
+    """
+    Generate timeline summary by breaking transcript into chunks.
 
-        # Calculate optimal number of chunks (aim for 1-2 minute segments)
-        target_segment_duration = 90  # 1.5 minutes
-        num_chunks = max(2, min(8, duration_seconds // target_segment_duration))
-        words_per_chunk = max(10, len(words) // num_chunks)
+    Returns (timeline_items, degraded), where degraded is True if any chunk
+    could not be summarized.
+    """
+    try:
+        timestamps, chunks = _split_timeline_chunks(transcript, duration_seconds)
+        if not chunks:
+            return [], False
+
+        # One batched Gemini request covers every chunk; fall back to per-chunk
+        # requests if the batched response can't be parsed.
+        try:
+            summaries = await summarize_timeline_segments(chunks)
+        except Exception as e:
+            logger.warning(f"Batched timeline summary failed, summarizing chunks individually: {e}")
+            summaries = await _summarize_chunks_individually(chunks)
 
         timeline_items = []
-        
-        for i in range(num_chunks):
-            start_time = (i * duration_seconds) // num_chunks
-            end_time = min(((i + 1) * duration_seconds) // num_chunks, duration_seconds)
-            
-            start_word = i * words_per_chunk
-            end_word = min((i + 1) * words_per_chunk, len(words))
-            
-            chunk_text = " ".join(words[start_word:end_word])
-
-            if chunk_text.strip() and len(chunk_text.strip()) > 20:
-                try:
-                    chunk_summary = await summarize_transcript(chunk_text)
-                    timeline_items.append({
-                        "timestamp": f"{start_time//60:02d}:{start_time%60:02d} - {end_time//60:02d}:{end_time%60:02d}",
-                        "summary": chunk_summary
-                    })
-                except Exception as e:
-                    logger.warning(f"Failed to summarize chunk {i}: {e}")
-                    continue
-
-        return timeline_items
+        degraded = False
+
+        for i, (timestamp, chunk_summary) in enumerate(zip(timestamps, summaries)):
+            if isinstance(chunk_summary, Exception):
+                logger.warning(f"Failed to summarize chunk {i}: {chunk_summary}")
+                degraded = True
+                continue
+            if chunk_summary == SUMMARY_FALLBACK:
+                degraded = True
+            timeline_items.append(TimelineItem.model_construct(
+                timestamp=timestamp,
+                summary=chunk_summary
+            ))
+
+        return timeline_items, degraded
 
     except Exception as e:
         logger.error(f"Error generating timeline summary: {str(e)}")
-        return []
+        return [], True
+
+async def _stream_timeline_summary(transcript: str, duration_seconds: int):
+    """
+    Yield (index, TimelineItem) pairs as each timeline chunk is summarized.
+
+    Chunks are summarized individually so results can be sent as soon as they
+    arrive, so items are yielded in completion order rather than timeline order.
+    """
+    try:
+        timestamps, chunks = _split_timeline_chunks(transcript, duration_seconds)
+    except Exception as e:
+        logger.error(f"Error generating timeline summary: {str(e)}")
+        return
+
+    # Bounded to stay within Gemini rate limits
+    semaphore = asyncio.Semaphore(TIMELINE_MAX_CONCURRENCY)
+
+    async def _summarize_chunk(index: int, chunk_text: str):
+        async with semaphore:
+            return index, await summarize_transcript(chunk_text)
+
+    tasks = [
+        asyncio.create_task(_summarize_chunk(index, chunk_text))
+        for index, chunk_text in enumerate(chunks)
+    ]
+
+    try:
+        for next_completed in asyncio.as_completed(tasks):
+            try:
+                index, chunk_summary = await next_completed
+            except Exception as e:
+                logger.warning(f"Failed to summarize timeline chunk: {e}")
+                continue
+            yield index, TimelineItem.model_construct(
+                timestamp=timestamps[index],
+                summary=chunk_summary
+            )
+    finally:
+        for task in tasks:
+            task.cancel()
+
+def _split_timeline_chunks(transcript: str, duration_seconds: int):
+    """Split a transcript into timeline chunks, returning (timestamps, chunk_texts)."""
+    if not transcript or duration_seconds <= 0:
+        return [], []
+
+    # Work with word offsets into the transcript instead of materializing
+    # a list of every word and re-joining slices of it per chunk.
+    word_count = sum(1 for _ in _WORD_RE.finditer(transcript))
+    if word_count < 10:  # Too short for meaningful timeline
+        return [], []
+
+    # Calculate optimal number of chunks (aim for 1-2 minute segments)
+    target_segment_duration = 90  # 1.5 minutes
+    num_chunks = max(2, min(8, duration_seconds // target_segment_duration))
+    words_per_chunk = max(10, word_count // num_chunks)
+
+    chunk_starts = [None] * num_chunks
+    chunk_ends = [None] * num_chunks
+
+    for index, match in enumerate(_WORD_RE.finditer(transcript)):
+        chunk_index, offset = divmod(index, words_per_chunk)
+        if chunk_index >= num_chunks:
+            break
+        if offset == 0:
+            chunk_starts[chunk_index] = match.start()
+        chunk_ends[chunk_index] = match.end()
+
+    timestamps = []
+    chunks = []
+
+    for i in range(num_chunks):
+        start_time = (i * duration_seconds) // num_chunks
+        end_time = min(((i + 1) * duration_seconds) // num_chunks, duration_seconds)
+
+        if chunk_starts[i] is None:
+            continue
+
+        chunk_text = transcript[chunk_starts[i]:chunk_ends[i]]
+
+        if len(chunk_text) > 20:
+            timestamps.append(
+                f"{start_time//60:02d}:{start_time%60:02d} - {end_time//60:02d}:{end_time%60:02d}"
+            )
+            chunks.append(chunk_text)
+
+    return timestamps, chunks
+
+async def _summarize_chunks_individually(chunks):
+    """Summarize each timeline chunk in its own Gemini request, concurrently."""
+    # Bounded to stay within Gemini rate limits
+    semaphore = asyncio.Semaphore(TIMELINE_MAX_CONCURRENCY)
+
+    async def _summarize_chunk(chunk_text: str) -> str:
+        async with semaphore:
+            return await summarize_transcript(chunk_text)
+
+    return await asyncio.gather(
+        *(_summarize_chunk(chunk_text) for chunk_text in chunks),
+        return_exceptions=True
+    )
 
 @router.get("/analyze/status/{task_id}")
 async def get_analysis_status(task_id: str):
@@ -256,7 +626,7 @@ async def get_analysis_status(task_id: str):
     }
 
 @router.get("/analyze/health")
-async def health_check():
+async def health_check(transcriber_service: TranscriberService = Depends(get_transcriber_service)):
     """
     Check the health of analysis services.
     """
@@ -270,4 +640,4 @@ async def health_check():
         "status": "healthy",
         "services": services_status,
         "timestamp": "2024-01-01T00:00:00Z"  # TODO: Add actual timestamp
-    }
\ No newline at end of file
+    }
@@ -1,68 +1,71 @@
 import os
+import asyncio
+import hashlib
 import logging
-from typing import Dict, List
-import google.generativeai as genai
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+from pydantic import ValidationError
 from models.schemas import ContentRecommendation
-import json
+from utils.cache import LRUCache, SqliteCache
+from services.rate_limit import ModelLimiter
+import orjson
 
 logger = logging.getLogger(__name__)
 
-class GeminiService:
-    """Service for interacting with Google Gemini AI."""
-    
-    def __init__(self):
-        self.api_key = os.getenv("GEMINI_API_KEY")
-        if self.api_key:
-            try:
-                genai.configure(api_key=self.api_key)
-                self.model = genai.GenerativeModel('gemini-pro')
-                logger.info("Gemini service initialized successfully")
-            except Exception as e:
-                logger.error(f"Failed to initialize Gemini: {e}")
-                self.model = None
-        else:
-            logger.error("GEMINI_API_KEY not found. GeminiService cannot function.")
-            self.model = None
+# Model used for every Gemini request; JSON mode (response_mime_type) needs a 1.5 model
+GEMINI_MODEL_NAME = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
 
-    async def _generate_content(self, prompt: str) -> str:
-        """Generate content using Gemini API with error handling."""
-        if not self.model:
-            raise Exception("Gemini model is not initialized. Please check your GEMINI_API_KEY.")
-        
-        try:
-            response = self.model.generate_content(
-                prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=0.7,
-                    top_p=0.8,
-                    top_k=40,
-                    max_output_tokens=2048,
-                )
-            )
-            
-            if not response.text:
-                raise Exception("Gemini returned empty response")
-                
-            return response.text
-        except Exception as e:
-            logger.error(f"Gemini API error: {str(e)}")
-            raise Exception(f"Failed to generate content from Gemini: {str(e)}")
+# Optional model for generate_content_idea only (e.g. gemini-1.5-pro), where
+# JSON fidelity matters more than latency
+GEMINI_RECOMMENDATION_MODEL_NAME = os.getenv("GEMINI_RECOMMENDATION_MODEL") or None
 
+# Upper bound on a single Gemini call, so one slow response can't hold up a request
+GEMINI_REQUEST_TIMEOUT_SECONDS = 20
 
-gemini_service = GeminiService()
+# Maximum number of Gemini requests in flight across the process
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "4"))
 
-async def summarize_transcript(transcript_chunk: str) -> str:
-    """
-    Summarize a transcript chunk using Gemini AI.
-    """
-    if not transcript_chunk or len(transcript_chunk.strip()) < 10:
-        return "No content available to summarize."
-    
-    prompt = f"""
+# Maximum number of Gemini responses kept in memory, keyed by prompt hash
+PROMPT_CACHE_SIZE = 1024
+
+# Gemini responses also persist here so re-analyzing a video after a restart
+# costs no API quota; set LLM_CACHE_PATH to an empty string to disable. The
+# database is shared safely by all workers, and is bounded in age and size.
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "data/llm_cache.sqlite3")
+LLM_CACHE_TTL_SECONDS = 30 * 24 * 3600
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "20000"))
+
+# Transcripts longer than this are summarized in chunks of at most this many
+# characters, in parallel, and the partial summaries are then combined
+SUMMARY_CHUNK_CHARS = 8000
+
+# Maximum number of chunk summaries requested from Gemini at once
+SUMMARY_MAX_CONCURRENCY = 8
+
+# Document types read as plain text by summarize_document
+TEXT_DOCUMENT_SUFFIXES = {".txt", ".md", ".csv"}
+
+# summarize_document only reads files under this directory; file_path comes
+# from the request body, so anything else on the server is off limits
+DOCUMENT_ROOT = Path(os.getenv("DOCUMENT_ROOT", "data/uploads")).resolve()
+
+# Returned in place of a summary or viral explanation when Gemini fails, so
+# callers can tell a degraded result from a real one
+SUMMARY_FALLBACK = "Unable to generate summary at this time."
+VIRAL_EXPLANATION_FALLBACK = (
+    "This content shows strong viral potential due to its engaging topic and presentation style."
+)
+
+# Static parts of the prompts below, built once at import instead of being
+# re-formatted into a fresh multi-line f-string on every call
+_SUMMARY_PROMPT_PREFIX = """
     Please provide a comprehensive and engaging summary of the following content in 3-4 sentences. 
     Focus on the key points, main insights, and valuable information that viewers would find most interesting:
     
-    Content: "{transcript_chunk[:4000]}"  # Limit content length
+    Content: """
+
+_SUMMARY_PROMPT_SUFFIX = """
     
     Requirements:
     - Write in clear, engaging language
@@ -72,25 +75,13 @@ async def summarize_transcript(transcript_chunk: str) -> str:
     
     Summary:
     """
-    
-    try:
-        summary = await gemini_service._generate_content(prompt)
-        return summary.strip()
-    except Exception as e:
-        logger.error(f"Error summarizing transcript: {e}")
-        return "Unable to generate summary at this time."
 
-async def explain_why_viral(title: str, views: int, likes: int, summary: str) -> str:
-    """
-    Generate explanation for why content has viral potential.
-    """
-    prompt = f"""
+_VIRAL_PROMPT_PREFIX = """
     Analyze why this content has viral potential based on the following information:
     
-    Title: {title}
-    Views: {views:,} 
-    Likes: {likes:,}
-    Content Summary: {summary[:1000]}
+    """
+
+_VIRAL_PROMPT_SUFFIX = """
     
     Provide a detailed analysis (4-5 sentences) covering:
     1. What specific elements make this content engaging and shareable
@@ -102,37 +93,26 @@ async def explain_why_viral(title: str, views: int, likes: int, summary: str) ->
     
     Analysis:
     """
-    
-    try:
-        explanation = await gemini_service._generate_content(prompt)
-        return explanation.strip()
-    except Exception as e:
-        logger.error(f"Error generating viral explanation: {e}")
-        return "This content shows strong viral potential due to its engaging topic and presentation style."
 
-async def generate_content_idea(category: str, summary: str, reason: str) -> ContentRecommendation:
-    """
-    Generate content recommendation based on analysis by requesting a JSON object.
-    """
-    prompt = f"""
+_IDEA_PROMPT_PREFIX = """
     Based on this successful content analysis, generate a new viral content idea that follows similar patterns:
     
-    Category: {category}
-    Original Content Summary: {summary[:800]}
-    Viral Success Factors: {reason[:800]}
+    """
+
+_IDEA_PROMPT_SUFFIX = """
     
     Create a detailed content recommendation in valid JSON format with these exact keys:
     
-    {{
+    {
         "title": "A compelling, clickable title that creates curiosity (string)",
         "target_audience": "Specific target audience description (string)", 
         "content_style": "Recommended content style and format (string)",
-        "suggested_structure": {{
+        "suggested_structure": {
             "hook": "Attention-grabbing opening (15-30 seconds)",
             "introduction": "Brief setup and value proposition", 
             "main_content": "Core content delivery strategy",
             "call_to_action": "Engagement and conversion strategy"
-        }},
+        },
         "pro_tips": [
             "Specific actionable tip 1",
             "Specific actionable tip 2", 
@@ -141,86 +121,547 @@ async def generate_content_idea(category: str, summary: str, reason: str) -> Con
             "Specific actionable tip 5"
         ],
         "estimated_viral_score": 75
-    }}
+    }
     
     Make the recommendation specific, actionable, and based on current viral content trends.
     Ensure the estimated_viral_score is between 60-95.
     
     JSON Response:
     """
+
+_FULL_ANALYSIS_PROMPT_PREFIX = """
+    Analyze the following content and respond with a single JSON object covering
+    its summary, why it has viral potential, and a new content idea that follows
+    similar patterns.
+    
+    """
+
+_FULL_ANALYSIS_PROMPT_SUFFIX = """
+    
+    Return ONLY a valid JSON object with these exact keys:
+    
+    {
+        "summary": "A comprehensive, engaging summary of the content in 3-4 sentences, highlighting the key points and actionable insights (string)",
+        "viral_explanation": "A 4-5 sentence analysis of what makes the content engaging and shareable, why it resonates with audiences, its key viral factors, and how it taps into current trends (string)",
+        "recommendation": {
+            "title": "A compelling, clickable title that creates curiosity (string)",
+            "target_audience": "Specific target audience description (string)",
+            "content_style": "Recommended content style and format (string)",
+            "suggested_structure": {
+                "hook": "Attention-grabbing opening (15-30 seconds)",
+                "introduction": "Brief setup and value proposition",
+                "main_content": "Core content delivery strategy",
+                "call_to_action": "Engagement and conversion strategy"
+            },
+            "pro_tips": [
+                "Specific actionable tip 1",
+                "Specific actionable tip 2",
+                "Specific actionable tip 3",
+                "Specific actionable tip 4",
+                "Specific actionable tip 5"
+            ],
+            "estimated_viral_score": 75
+        }
+    }
+    
+    Make the recommendation specific, actionable, and based on current viral content trends.
+    Ensure the estimated_viral_score is between 60-95.
+    
+    JSON Response:
+    """
+
+_TIMELINE_PROMPT_INSTRUCTIONS = """
+    Focus on the key points of each segment, in clear and engaging language.
+    
+    Return ONLY a valid JSON array with one string per segment, where the string at
+    index i is the summary of segment [i].
+    
+    Segments:
+    
+    """
+
+_JSON_PROMPT_SUFFIX = """
+    
+    JSON Response:
+    """
+
+class DocumentAccessError(ValueError):
+    """Raised when a requested document lies outside DOCUMENT_ROOT."""
+
+class GeminiService:
+    """Service for interacting with Google Gemini AI."""
+    
+    def __init__(self):
+        self._response_cache = LRUCache(maxsize=PROMPT_CACHE_SIZE)
+        self._disk_cache = (
+            SqliteCache(LLM_CACHE_PATH, ttl=LLM_CACHE_TTL_SECONDS, max_entries=LLM_CACHE_MAX_ENTRIES)
+            if LLM_CACHE_PATH else None
+        )
+        self._limiter = ModelLimiter(GEMINI_MAX_CONCURRENCY)
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.api_key = os.getenv("GEMINI_API_KEY")
+        if not self.api_key:
+            logger.error("GEMINI_API_KEY not found. GeminiService cannot function.")
+        # The SDK is imported and the model created on the first request, so
+        # importing this module (once per worker) doesn't pay for loading
+        # google.generativeai (grpc, protobuf) or for model setup
+        self.model = None
+        self._genai = None
+        self._models = {}
+        self._generation_config = None
+        self._json_generation_config = None
+        self._model_initialized = False
+
+    def _get_model(self, model_name: Optional[str] = None):
+        """
+        Configure Gemini and create the default model on first use.
+
+        model_name selects a model other than GEMINI_MODEL_NAME; each one is
+        created once and reused.
+        """
+        if not self._model_initialized:
+            self._model_initialized = True
+            if self.api_key:
+                try:
+                    import google.generativeai as genai
+
+                    genai.configure(api_key=self.api_key)
+                    self._genai = genai
+                    self.model = genai.GenerativeModel(GEMINI_MODEL_NAME)
+                    self._generation_config = genai.types.GenerationConfig(
+                        temperature=0.7,
+                        top_p=0.8,
+                        top_k=40,
+                        max_output_tokens=2048,
+                    )
+                    # Same sampling, but decoding is constrained to valid JSON
+                    self._json_generation_config = genai.types.GenerationConfig(
+                        temperature=0.7,
+                        top_p=0.8,
+                        top_k=40,
+                        max_output_tokens=2048,
+                        response_mime_type="application/json",
+                    )
+                    logger.info("Gemini service initialized successfully")
+                except Exception as e:
+                    logger.error(f"Failed to initialize Gemini: {e}")
+                    self.model = None
+
+        if self.model is None or model_name is None or model_name == GEMINI_MODEL_NAME:
+            return self.model
+
+        model = self._models.get(model_name)
+        if model is None:
+            model = self._genai.GenerativeModel(model_name)
+            self._models[model_name] = model
+        return model
+
+    async def _generate_content(
+        self,
+        prompt: str,
+        cache: bool = True,
+        json_mode: bool = False,
+        model_name: Optional[str] = None
+    ) -> str:
+        """
+        Generate content using Gemini API with error handling.
+
+        With json_mode, Gemini is constrained to return a bare JSON document.
+        model_name overrides GEMINI_MODEL_NAME for this request.
+        Responses are cached by prompt hash in memory and on disk; pass
+        cache=False to skip the lookup and refresh the stored response.
+        """
+        model = self._get_model(model_name)
+        if not model:
+            raise Exception("Gemini model is not initialized. Please check your GEMINI_API_KEY.")
+
+        # The same prompt answers differently per model and in JSON mode, so
+        # key on both too
+        cache_key = f"{model_name or GEMINI_MODEL_NAME}:{hashlib.sha256(prompt.encode()).hexdigest()}"
+        if json_mode:
+            cache_key = f"json:{cache_key}"
+        if cache:
+            cached = await self._get_cached_response(cache_key)
+            if cached is not None:
+                logger.debug("Gemini prompt cache hit")
+                return cached
+
+        # Identical prompts issued while a request for them is still running
+        # (e.g. several users analyzing the same video at once) share that
+        # request instead of each calling Gemini
+        request = self._in_flight.get(cache_key)
+        if request is None:
+            request = asyncio.ensure_future(
+                self._request_content(model, prompt, cache_key, json_mode)
+            )
+            self._in_flight[cache_key] = request
+            request.add_done_callback(lambda done: self._finish_request(cache_key, done))
+        else:
+            logger.debug("Joining in-flight Gemini request")
+
+        # Shielded so one caller being cancelled doesn't cancel the request
+        # for the others sharing it
+        return await asyncio.shield(request)
+
+    async def _request_content(self, model, prompt: str, cache_key: str, json_mode: bool) -> str:
+        """Call Gemini for a prompt and cache the response."""
+        try:
+            response = await self._limiter.call(
+                model.generate_content_async,
+                prompt,
+                generation_config=self._json_generation_config if json_mode else self._generation_config,
+                request_options={"timeout": GEMINI_REQUEST_TIMEOUT_SECONDS}
+            )
+            
+            if not response.text:
+                raise Exception("Gemini returned empty response")
+
+            await self._set_cached_response(cache_key, response.text)
+            return response.text
+        except Exception as e:
+            logger.error(f"Gemini API error: {str(e)}")
+            raise Exception(f"Failed to generate content from Gemini: {str(e)}")
+
+    def _finish_request(self, cache_key: str, request: asyncio.Future) -> None:
+        """Forget a completed in-flight request."""
+        self._in_flight.pop(cache_key, None)
+        # Mark a failure as retrieved in case every caller was cancelled and
+        # nobody awaits it, which would otherwise log a warning
+        if not request.cancelled():
+            request.exception()
+
+    async def _get_cached_response(self, cache_key: str):
+        """Look a response up in memory, then on disk."""
+        cached = self._response_cache.get(cache_key)
+        if cached is None and self._disk_cache is not None:
+            try:
+                cached = await asyncio.to_thread(self._disk_cache.get, cache_key)
+            except Exception as e:
+                logger.warning(f"Failed to read Gemini response cache: {e}")
+                return None
+            if cached is not None:
+                self._response_cache.set(cache_key, cached)
+        return cached
+
+    async def _set_cached_response(self, cache_key: str, text: str) -> None:
+        """Store a response in memory and on disk; a failed disk write is only logged."""
+        self._response_cache.set(cache_key, text)
+        if self._disk_cache is not None:
+            try:
+                await asyncio.to_thread(self._disk_cache.set, cache_key, text)
+            except Exception as e:
+                logger.warning(f"Failed to persist Gemini response cache: {e}")
+
+
+_gemini_service: Optional[GeminiService] = None
+_gemini_service_lock = threading.Lock()
+
+def _get_gemini() -> GeminiService:
+    """
+    Return the shared GeminiService, creating it on first use.
+
+    Nothing is constructed at import, so preloading or forking workers does
+    no Gemini setup. The lock keeps concurrent first calls from different
+    threads from each building their own instance.
+    """
+    global _gemini_service
+    if _gemini_service is None:
+        with _gemini_service_lock:
+            if _gemini_service is None:
+                _gemini_service = GeminiService()
+    return _gemini_service
+
+async def summarize_transcript(transcript_chunk: str) -> str:
+    """
+    Summarize a transcript chunk using Gemini AI.
+    
+    Long transcripts are split into chunks that are summarized in parallel,
+    then the partial summaries are summarized into one.
+    """
+    if not transcript_chunk or len(transcript_chunk.strip()) < 10:
+        return "No content available to summarize."
+    
+    if len(transcript_chunk) > SUMMARY_CHUNK_CHARS:
+        return await _summarize_long_transcript(transcript_chunk)
+    
+    return await _summarize_text(transcript_chunk)
+
+async def _summarize_text(text: str) -> str:
+    """Summarize text that fits in a single Gemini prompt."""
+    prompt = f'{_SUMMARY_PROMPT_PREFIX}"{text[:SUMMARY_CHUNK_CHARS]}"{_SUMMARY_PROMPT_SUFFIX}'
     
     try:
-        response_text = await gemini_service._generate_content(prompt)
-        
-        # Clean and parse JSON response
-        clean_json_text = response_text.strip()
-        
-        # Remove markdown code blocks if present
-        if clean_json_text.startswith('```json'):
-            clean_json_text = clean_json_text[7:]
-        if clean_json_text.startswith('```'):
-            clean_json_text = clean_json_text[3:]
-        if clean_json_text.endswith('```'):
-            clean_json_text = clean_json_text[:-3]
-        
-        clean_json_text = clean_json_text.strip()
-        
-        # Parse JSON
-        data = json.loads(clean_json_text)
+        summary = await _get_gemini()._generate_content(prompt)
+        return summary.strip()
+    except Exception as e:
+        logger.error(f"Error summarizing transcript: {e}")
+        return SUMMARY_FALLBACK
+
+async def _summarize_long_transcript(transcript: str) -> str:
+    """Map-reduce summary: summarize each chunk concurrently, then combine the results."""
+    chunks = _split_text_chunks(transcript, SUMMARY_CHUNK_CHARS)
+    
+    # Bounded to stay within Gemini rate limits
+    semaphore = asyncio.Semaphore(SUMMARY_MAX_CONCURRENCY)
+    
+    async def _summarize_chunk(chunk: str) -> str:
+        async with semaphore:
+            summary = await _get_gemini()._generate_content(
+                f'{_SUMMARY_PROMPT_PREFIX}"{chunk}"{_SUMMARY_PROMPT_SUFFIX}'
+            )
+            return summary.strip()
+    
+    partials = await asyncio.gather(
+        *(_summarize_chunk(chunk) for chunk in chunks),
+        return_exceptions=True
+    )
+    
+    partial_summaries = []
+    for i, partial in enumerate(partials):
+        if isinstance(partial, Exception):
+            logger.warning(f"Failed to summarize transcript chunk {i}: {partial}")
+        elif partial:
+            partial_summaries.append(partial)
+    
+    if not partial_summaries:
+        return SUMMARY_FALLBACK
+    
+    if len(partial_summaries) == 1:
+        return partial_summaries[0]
+    
+    # Many chunks can produce partials longer than one prompt holds, so the
+    # reduce recurses until they fit instead of truncating them; the guard
+    # stops a round that didn't shrink the text from looping forever
+    combined = "\n\n".join(partial_summaries)
+    if len(combined) >= len(transcript):
+        return await _summarize_text(combined)
+    return await summarize_transcript(combined)
+
+def _split_text_chunks(text: str, max_chars: int) -> List[str]:
+    """
+    Split text into chunks of at most max_chars.
+    
+    Chunks end at the last sentence boundary that fits, falling back to the
+    last space (auto-generated captions often have no punctuation).
+    """
+    chunks = []
+    start = 0
+    
+    while len(text) - start > max_chars:
+        end = start + max_chars
+        cut = max(text.rfind(". ", start, end), text.rfind("! ", start, end), text.rfind("? ", start, end))
+        if cut > start:
+            cut += 1  # Keep the punctuation with its sentence
+        else:
+            cut = text.rfind(" ", start, end)
+            if cut <= start:
+                cut = end
+        chunks.append(text[start:cut].strip())
+        start = cut
+    
+    chunks.append(text[start:].strip())
+    return [chunk for chunk in chunks if chunk]
+
+async def explain_why_viral(title: str, views: int, likes: int, summary: str) -> str:
+    """
+    Generate explanation for why content has viral potential.
+    """
+    prompt = (
+        f"{_VIRAL_PROMPT_PREFIX}"
+        f"Title: {title}\n    Views: {views:,} \n    Likes: {likes:,}\n"
+        f"    Content Summary: {summary[:1000]}"
+        f"{_VIRAL_PROMPT_SUFFIX}"
+    )
+    
+    try:
+        explanation = await _get_gemini()._generate_content(prompt)
+        return explanation.strip()
+    except Exception as e:
+        logger.error(f"Error generating viral explanation: {e}")
+        return VIRAL_EXPLANATION_FALLBACK
+
+async def generate_content_idea(category: str, summary: str, reason: str) -> ContentRecommendation:
+    """
+    Generate content recommendation based on analysis by requesting a JSON object.
+    """
+    prompt = (
+        f"{_IDEA_PROMPT_PREFIX}"
+        f"Category: {category}\n"
+        f"    Original Content Summary: {summary[:800]}\n"
+        f"    Viral Success Factors: {reason[:800]}"
+        f"{_IDEA_PROMPT_SUFFIX}"
+    )
+    
+    try:
+        response_text = await _get_gemini()._generate_content(
+            prompt,
+            json_mode=True,
+            model_name=GEMINI_RECOMMENDATION_MODEL_NAME
+        )
         
-        # Validate and create ContentRecommendation
-        recommendation = ContentRecommendation(**data)
+        # Parse and validate in a single pass over the JSON text
+        recommendation = ContentRecommendation.model_validate_json(response_text)
         return recommendation
         
-    except json.JSONDecodeError as e:
-        logger.error(f"JSON parsing error in content recommendation: {e}")
+    except ValidationError as e:
+        logger.error(f"Invalid JSON in content recommendation: {e}")
         logger.error(f"Raw response: {response_text[:500]}...")
         return _create_fallback_recommendation()
     except Exception as e:
         logger.error(f"Error generating content idea: {str(e)}")
         return _create_fallback_recommendation()
 
+async def generate_full_analysis(title: str, views: int, likes: int, category: str, transcript: str) -> Dict:
+    """
+    Generate the summary, viral explanation and content recommendation with a single Gemini request.
+    
+    Returns a dict with "summary", "viral_explanation" and "recommendation" keys.
+    Raises an exception if Gemini's response is unusable, so callers can fall
+    back to summarize_transcript, explain_why_viral and generate_content_idea.
+    
+    A transcript longer than SUMMARY_CHUNK_CHARS is first condensed with the
+    map-reduce summary, so the analysis covers the whole video rather than
+    its opening minutes.
+    """
+    content = transcript
+    if len(transcript) > SUMMARY_CHUNK_CHARS:
+        content = await _summarize_long_transcript(transcript)
+        if content == SUMMARY_FALLBACK:
+            raise ValueError("Could not condense the transcript for analysis")
+    
+    prompt = (
+        f"{_FULL_ANALYSIS_PROMPT_PREFIX}"
+        f"Title: {title}\n    Views: {views:,} \n    Likes: {likes:,}\n"
+        f"    Category: {category}\n"
+        f'    Content: "{content[:4000]}"'
+        f"{_FULL_ANALYSIS_PROMPT_SUFFIX}"
+    )
+    
+    response_text = await _get_gemini()._generate_content(prompt, json_mode=True)
+    analysis = orjson.loads(response_text)
+    
+    if not isinstance(analysis, dict):
+        raise ValueError("Expected a JSON object from Gemini")
+    
+    summary = analysis.get("summary")
+    viral_explanation = analysis.get("viral_explanation")
+    if not isinstance(summary, str) or not summary.strip():
+        raise ValueError("Gemini analysis is missing a summary")
+    if not isinstance(viral_explanation, str) or not viral_explanation.strip():
+        raise ValueError("Gemini analysis is missing a viral explanation")
+    
+    return {
+        "summary": summary.strip(),
+        "viral_explanation": viral_explanation.strip(),
+        "recommendation": ContentRecommendation.model_validate(analysis.get("recommendation")),
+    }
+
+async def summarize_timeline_segments(segments: List[str]) -> List[str]:
+    """
+    Summarize several transcript segments with a single Gemini request.
+    
+    Returns one summary per segment, in the same order.
+    """
+    numbered_segments = "\n\n".join(
+        f"[{i}] {segment[:4000]}" for i, segment in enumerate(segments)
+    )
+    
+    prompt = (
+        f"\n    Summarize each of the following {len(segments)} video transcript segments in 2 sentences."
+        f"{_TIMELINE_PROMPT_INSTRUCTIONS}"
+        f"{numbered_segments}"
+        f"{_JSON_PROMPT_SUFFIX}"
+    )
+    
+    response_text = await _get_gemini()._generate_content(prompt, json_mode=True)
+    summaries = orjson.loads(response_text)
+    
+    if (
+        not isinstance(summaries, list)
+        or len(summaries) != len(segments)
+        or not all(isinstance(summary, str) for summary in summaries)
+    ):
+        raise ValueError(f"Expected a JSON array of {len(segments)} summaries from Gemini")
+    
+    return [summary.strip() for summary in summaries]
+
 def _create_fallback_recommendation() -> ContentRecommendation:
     """Create a fallback recommendation when AI generation fails."""
-    return ContentRecommendation(
-        title="Create Engaging Content That Drives Results",
-        target_audience="Content creators, entrepreneurs, and digital marketers aged 25-45",
-        content_style="Educational tutorial with practical examples and clear step-by-step guidance",
-        suggested_structure={
-            "hook": "Start with a compelling question or surprising statistic that grabs attention",
-            "introduction": "Briefly introduce the problem you're solving and the value you'll provide",
-            "main_content": "Deliver actionable steps with real examples and visual demonstrations",
-            "call_to_action": "Encourage viewers to try the technique and share their results"
-        },
-        pro_tips=[
-            "Focus on solving a specific problem your audience faces daily",
-            "Use clear, conversational language that's easy to follow",
-            "Include visual elements and examples to maintain engagement",
-            "Create content that viewers will want to save and share",
-            "Optimize your title and thumbnail for maximum click-through rate"
-        ],
-        estimated_viral_score=78
-    )
+    return _FALLBACK_RECOMMENDATION
+
+def is_fallback_recommendation(recommendation: ContentRecommendation) -> bool:
+    """Whether recommendation is the fallback rather than one Gemini generated."""
+    return recommendation is _FALLBACK_RECOMMENDATION
+
+# Static, trusted data: built once at import without validation. The model is
+# frozen, so the same instance can be shared by every response that needs it.
+_FALLBACK_RECOMMENDATION = ContentRecommendation.model_construct(
+    title="Create Engaging Content That Drives Results",
+    target_audience="Content creators, entrepreneurs, and digital marketers aged 25-45",
+    content_style="Educational tutorial with practical examples and clear step-by-step guidance",
+    suggested_structure={
+        "hook": "Start with a compelling question or surprising statistic that grabs attention",
+        "introduction": "Briefly introduce the problem you're solving and the value you'll provide",
+        "main_content": "Deliver actionable steps with real examples and visual demonstrations",
+        "call_to_action": "Encourage viewers to try the technique and share their results"
+    },
+    pro_tips=[
+        "Focus on solving a specific problem your audience faces daily",
+        "Use clear, conversational language that's easy to follow",
+        "Include visual elements and examples to maintain engagement",
+        "Create content that viewers will want to save and share",
+        "Optimize your title and thumbnail for maximum click-through rate"
+    ],
+    estimated_viral_score=78
+)
 
 async def summarize_document(file_path: str) -> str:
     """
     Summarize document content.
+
+    file_path is resolved against DOCUMENT_ROOT; DocumentAccessError is raised
+    for a path that escapes it.
     """
     logger.info(f"Summarizing document: {file_path}")
     
-    # TODO: Implement actual document reading and processing
-    # This would involve reading PDF, Word, or other document formats
-    # and extracting text content for summarization
+    # Reading and parsing (PDF/Word) is blocking, CPU-heavy work, so keep it
+    # off the event loop
+    document_text = await asyncio.to_thread(_read_document_text, file_path)
     
-    mock_summary = f"""
-    Document Analysis Summary:
+    if not document_text.strip():
+        raise ValueError(f"No text content could be extracted from document: {file_path}")
     
-    This document contains comprehensive information covering strategic planning, 
-    implementation guidelines, and industry best practices. Key themes include 
-    process optimization, stakeholder engagement, and measurable outcomes.
+    return await summarize_transcript(document_text)
+
+def _read_document_text(file_path: str) -> str:
+    """Extract plain text from a text, PDF or Word document under DOCUMENT_ROOT."""
+    path = _resolve_document_path(file_path)
+    suffix = path.suffix.lower()
     
-    The content provides actionable insights for professionals looking to improve 
-    their operational efficiency and strategic decision-making capabilities.
-    """
+    if suffix in TEXT_DOCUMENT_SUFFIXES:
+        return path.read_text(encoding="utf-8", errors="replace")
+    
+    if suffix == ".pdf":
+        from pypdf import PdfReader
+        
+        reader = PdfReader(path)
+        return "\n".join(page.extract_text() or "" for page in reader.pages)
     
-    return await summarize_transcript(mock_summary)
\ No newline at end of file
+    if suffix == ".docx":
+        import docx
+        
+        document = docx.Document(str(path))
+        return "\n".join(paragraph.text for paragraph in document.paragraphs)
+    
+    raise ValueError(f"Unsupported document format: {suffix or 'unknown'}")
+
+def _resolve_document_path(file_path: str) -> Path:
+    """
+    Resolve file_path (relative to DOCUMENT_ROOT) and ensure it stays inside it.
+
+    Symlinks and ".." are resolved first, so neither can point outside the root.
+    """
+    path = (DOCUMENT_ROOT / file_path).resolve()
+    if not path.is_relative_to(DOCUMENT_ROOT):
+        raise DocumentAccessError("Document path is outside the document directory")
+    return path
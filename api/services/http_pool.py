@@ -0,0 +1,53 @@
+import os
+import logging
+import importlib.util
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on open connections across every service sharing the pool;
+# requests beyond it wait for a free connection instead of opening more
+HTTPX_MAX_CONNECTIONS = int(os.getenv("HTTPX_MAX_CONNECTIONS", "200"))
+HTTPX_MAX_KEEPALIVE_CONNECTIONS = int(
+    os.getenv("HTTPX_MAX_KEEPALIVE_CONNECTIONS", str(HTTPX_MAX_CONNECTIONS // 2))
+)
+
+# googleapis.com and api.openai.com both speak HTTP/2, which multiplexes
+# concurrent requests over one connection; it needs the h2 package
+# (httpx[http2]), so fall back to HTTP/1.1 without it
+HTTPX_HTTP2 = importlib.util.find_spec("h2") is not None
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the process-wide AsyncClient, creating it on first use.
+
+    Sharing one client keeps connections (and their TLS sessions) alive across
+    requests instead of reconnecting for every outbound call.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=HTTPX_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTPX_MAX_KEEPALIVE_CONNECTIONS
+            ),
+            timeout=httpx.Timeout(20.0, connect=5.0),
+            http2=HTTPX_HTTP2
+        )
+        logger.info(
+            f"Shared HTTP client created (max_connections={HTTPX_MAX_CONNECTIONS}, http2={HTTPX_HTTP2})"
+        )
+    return _http_client
+
+
+async def aclose_http_client() -> None:
+    """Close the shared client, if it was created. Called on application shutdown."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
@@ -0,0 +1,46 @@
+import asyncio
+import random
+import logging
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ModelLimiter:
+    """
+    Concurrency gate with jittered exponential backoff on rate-limit errors.
+
+    At most max_concurrency calls run at once. A call that fails with HTTP 429
+    is retried up to max_attempts in total, sleeping between attempts without
+    holding a slot so other calls can proceed meanwhile.
+    """
+
+    def __init__(self, max_concurrency: int, max_attempts: int = 3, base_delay: float = 1.0):
+        self.max_concurrency = max_concurrency
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        # Created on first use so it binds to the running event loop
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def call(self, coro_fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """Await coro_fn(*args, **kwargs) within the concurrency limit, retrying on 429."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        attempt = 0
+        while True:
+            try:
+                async with self._semaphore:
+                    return await coro_fn(*args, **kwargs)
+            except Exception as e:
+                attempt += 1
+                if attempt >= self.max_attempts or not _is_rate_limited(e):
+                    raise
+                delay = self.base_delay * 2 ** (attempt - 1) * random.uniform(0.75, 1.25)
+                logger.warning(f"Rate limited, retrying in {delay:.1f}s (attempt {attempt}/{self.max_attempts})")
+                await asyncio.sleep(delay)
+
+
+def _is_rate_limited(error: Exception) -> bool:
+    """Whether an SDK error is an HTTP 429 (OpenAI sets status_code, Google API errors set code)."""
+    return getattr(error, "status_code", None) == 429 or getattr(error, "code", None) == 429
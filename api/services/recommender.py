@@ -1,83 +0,0 @@
-import logging
-from models.schemas import VideoMetadata, ViralAnalysis, ContentRecommendation
-from typing import List
-
-logger = logging.getLogger(__name__)
-
-class RecommenderService:
-    """
-    Service for generating content recommendations based on analysis.
-    """
-    
-    def __init__(self):
-        pass
-    
-    async def generate_recommendations(
-        self, 
-        transcript: str, 
-        metadata: VideoMetadata, 
-        viral_analysis: ViralAnalysis
-    ) -> ContentRecommendation:
-        """
-        Generate content recommendations based on successful patterns.
-        
-        Args:
-            transcript: Full transcript text
-            metadata: Video metadata
-            viral_analysis: Viral analysis results
-            
-        Returns:
-            ContentRecommendation object with suggested content ideas
-        """
-        try:
-            logger.info("Generating content recommendations")
-            
-            # TODO: Implement actual recommendation algorithm
-            # This would analyze:
-            # 1. Successful content patterns
-            # 2. Audience preferences
-            # 3. Trending topics in the niche
-            # 4. Optimal content structure
-            # 5. Engagement optimization strategies
-            
-            # Mock recommendation for development
-            recommendation = ContentRecommendation(
-                title="Build Your First AI Chatbot in 10 Minutes - No Coding Required!",
-                target_audience="Entrepreneurs, small business owners, and tech enthusiasts aged 25-45",
-                content_style="Step-by-step tutorial with screen recording, upbeat music, and quick cuts",
-                suggested_structure={
-                    "hook": "Watch me build a chatbot that can answer customer questions 24/7",
-                    "introduction": "Brief explanation of why every business needs a chatbot",
-                    "main_content": "Step-by-step tutorial using a no-code platform",
-                    "call_to_action": "Encourage viewers to try it themselves and share results"
-                },
-                pro_tips=[
-                    "Use trending hashtags like #AI, #NoCode, #Automation",
-                    "Post during peak hours (7-9 PM in your target timezone)",
-                    "Create an eye-catching thumbnail with bright colors and clear text",
-                    "Engage with comments in the first hour after posting"
-                ],
-                estimated_viral_score=85
-            )
-            
-            return recommendation
-            
-        except Exception as e:
-            logger.error(f"Error generating recommendations: {str(e)}")
-            raise Exception(f"Failed to generate recommendations: {str(e)}")
-    
-    def _analyze_successful_patterns(self, viral_analysis: ViralAnalysis) -> dict:
-        """
-        Analyze patterns from successful viral content.
-        
-        TODO: Implement pattern analysis
-        """
-        pass
-    
-    def _generate_content_ideas(self, topic_category: str) -> List[str]:
-        """
-        Generate content ideas based on topic category.
-        
-        TODO: Implement content idea generation
-        """
-        pass
\ No newline at end of file
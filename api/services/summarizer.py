@@ -1,113 +0,0 @@
-import os
-import logging
-from typing import List
-from models.schemas import TimelineItem
-
-logger = logging.getLogger(__name__)
-
-class SummarizerService:
-    """
-    Service for generating summaries using Gemini or other LLM APIs.
-    """
-    
-    def __init__(self):
-        self.gemini_api_key = os.getenv("GEMINI_API_KEY")
-        self.openai_api_key = os.getenv("OPENAI_API_KEY")
-        # TODO: Initialize Gemini client when API key is available
-        
-    async def generate_summary(self, transcript: str) -> str:
-        """
-        Generate overall summary of the content.
-        
-        Args:
-            transcript: Full transcript text
-            
-        Returns:
-            Summary string
-        """
-        try:
-            logger.info("Generating overall summary")
-            
-            # TODO: Implement actual LLM API call
-            # Example prompt for Gemini/GPT:
-            # "Summarize the following video transcript in 2-3 sentences, focusing on key insights and main topics:"
-            
-            # Mock summary for development
-            mock_summary = """
-            This comprehensive guide explores the fundamental concepts of machine learning, covering supervised and 
-            unsupervised learning techniques, model evaluation, and practical applications in real-world scenarios. 
-            The video provides clear explanations of key algorithms like linear regression and decision trees, 
-            while emphasizing best practices for avoiding common pitfalls like overfitting and underfitting.
-            """
-            
-            return mock_summary.strip()
-            
-        except Exception as e:
-            logger.error(f"Error generating summary: {str(e)}")
-            raise Exception(f"Failed to generate summary: {str(e)}")
-    
-    async def generate_timeline_summary(self, transcript: str, duration_seconds: int) -> List[TimelineItem]:
-        """
-        Generate timeline-based summary breaking down content by time segments.
-        
-        Args:
-            transcript: Full transcript text
-            duration_seconds: Video duration in seconds
-            
-        Returns:
-            List of timeline items with timestamps and summaries
-        """
-        try:
-            logger.info("Generating timeline summary")
-            
-            # TODO: Implement actual timeline segmentation with LLM
-            # This would involve:
-            # 1. Splitting transcript into time-based chunks
-            # 2. Summarizing each chunk with LLM
-            # 3. Formatting timestamps properly
-            
-            # Mock timeline data for development
-            mock_timeline = [
-                TimelineItem(
-                    timestamp="00:00 - 01:00",
-                    summary="Introduction to machine learning concepts and why they matter in today's technology landscape."
-                ),
-                TimelineItem(
-                    timestamp="01:00 - 02:30",
-                    summary="Deep dive into supervised learning algorithms including linear regression and decision trees."
-                ),
-                TimelineItem(
-                    timestamp="02:30 - 04:00",
-                    summary="Practical examples of implementing basic ML models using Python and popular libraries."
-                ),
-                TimelineItem(
-                    timestamp="04:00 - 05:15",
-                    summary="Discussion of unsupervised learning techniques and clustering algorithms."
-                ),
-                TimelineItem(
-                    timestamp="05:15 - 06:30",
-                    summary="Best practices for model evaluation, cross-validation, and avoiding overfitting."
-                )
-            ]
-            
-            return mock_timeline
-            
-        except Exception as e:
-            logger.error(f"Error generating timeline summary: {str(e)}")
-            raise Exception(f"Failed to generate timeline summary: {str(e)}")
-    
-    async def _call_gemini_api(self, prompt: str) -> str:
-        """
-        Make API call to Google Gemini.
-        
-        TODO: Implement Gemini API integration
-        """
-        pass
-    
-    async def _call_openai_api(self, prompt: str) -> str:
-        """
-        Make API call to OpenAI GPT.
-        
-        TODO: Implement OpenAI API integration
-        """
-        pass
\ No newline at end of file
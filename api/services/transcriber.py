@@ -1,39 +1,109 @@
 import os
 import re
+import asyncio
 import logging
+import shutil
 import tempfile
+import threading
+import importlib.util
 import subprocess
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 from pathlib import Path
 
-# Import OpenAI client and specific error types
-from openai import OpenAI, APIConnectionError, RateLimitError, APIStatusError 
 from youtube_transcript_api import YouTubeTranscriptApi
 from youtube_transcript_api._errors import NoTranscriptFound, TranscriptsDisabled, VideoUnavailable
 from xml.etree.ElementTree import ParseError
+from utils.cache import LRUCache
+from services.http_pool import get_http_client
+from services.rate_limit import ModelLimiter
 
 logger = logging.getLogger(__name__)
 
+# Video ID in watch, youtu.be, embed, /v/ and shorts URLs, as one compiled pattern.
+# The lazy (?:.*?&)?? prefers a leading v= and otherwise takes the first &v=,
+# matching utils.youtube so transcript and metadata describe the same video.
+_VIDEO_ID_RE = re.compile(
+    r'(?:youtube\.com/(?:watch\?(?:.*?&)??v=|embed/|v/|shorts/)|youtu\.be/)([a-zA-Z0-9_-]+)'
+)
+
+# Maximum number of Whisper requests in flight across the process
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+
+# yt-dlp gives up on a download that stalls for this long
+YT_DLP_SOCKET_TIMEOUT_SECONDS = 30
+YT_DLP_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# Upper bounds on the Whisper fallback's audio download: overall time, file
+# size, and video length (longer videos are refused before downloading)
+AUDIO_DOWNLOAD_TIMEOUT_SECONDS = 300
+AUDIO_MAX_FILESIZE_BYTES = 200 * 1024 * 1024
+AUDIO_MAX_DURATION_SECONDS = 3 * 3600
+
+# Downloads run on their own small pool rather than the event loop's default
+# executor: each can hold a thread for minutes, and the default pool also
+# serves the SQLite caches, caption fetches and document parsing. Downloads
+# beyond this many queue here (their wait counts against the timeout).
+AUDIO_DOWNLOAD_MAX_CONCURRENCY = int(os.getenv("AUDIO_DOWNLOAD_MAX_CONCURRENCY", "2"))
+_audio_download_executor = ThreadPoolExecutor(
+    max_workers=AUDIO_DOWNLOAD_MAX_CONCURRENCY,
+    thread_name_prefix="audio-download"
+)
+
+# Whisper fallback audio is transcribed in segments of this length, concurrently
+AUDIO_SEGMENT_SECONDS = 600
+
+# Installed tools can't change while the process runs, so check once at
+# import; shutil.which is a PATH lookup and doesn't spawn ffmpeg
+_FFMPEG_AVAILABLE = shutil.which("ffmpeg") is not None
+_YT_DLP_AVAILABLE = importlib.util.find_spec("yt_dlp") is not None
+
+# Static parts of the Whisper request and of get_supported_formats, built once
+WHISPER_PROMPT = "This is a YouTube video transcript. Please transcribe accurately with proper punctuation."
+TOOL_REQUIREMENTS = {
+    "ffmpeg": "Required for audio extraction",
+    "yt-dlp": "Required for YouTube audio download",
+    "openai_api_key": "Required for Whisper transcription"
+}
+
+# Transcripts rarely change once published, so keep them for a day
+TRANSCRIPT_CACHE_TTL_SECONDS = 24 * 3600
+
 class TranscriberService:
     """
     Service for transcribing YouTube videos using youtube-transcript-api
     with a fallback to OpenAI's Whisper API.
     """
-    
+
     def __init__(self):
         """
         Initializes the service by checking for ffmpeg and setting up the OpenAI client.
         """
-        self._ffmpeg_available = self._check_ffmpeg_availability()
-        self._yt_dlp_available = self._check_yt_dlp_availability()
+        self._transcript_cache = LRUCache(maxsize=256, ttl=TRANSCRIPT_CACHE_TTL_SECONDS)
+        # The OpenAI client already retries 429s with backoff (max_retries),
+        # so the limiter only bounds concurrency
+        self._openai_limiter = ModelLimiter(OPENAI_MAX_CONCURRENCY, max_attempts=1)
+
+        self._ffmpeg_available = _FFMPEG_AVAILABLE
+        self._yt_dlp_available = _YT_DLP_AVAILABLE
+        if not self._ffmpeg_available:
+            logger.warning("ffmpeg not found on PATH")
+        if not self._yt_dlp_available:
+            logger.warning("yt-dlp is not installed")
         
         # Initialize OpenAI client
         openai_api_key = os.getenv("OPENAI_API_KEY")
         if openai_api_key:
             try:
-                self.openai_client = OpenAI(
+                # Imported here so workers without a key (or that never
+                # construct the service) don't pay for loading the SDK
+                from openai import AsyncOpenAI
+
+                self.openai_client = AsyncOpenAI(
                     api_key=openai_api_key,
-                    timeout=60.0  # Increased timeout for audio processing
+                    http_client=get_http_client(),
+                    timeout=60.0,  # Increased timeout for audio processing
+                    max_retries=3
                 )
                 logger.info("OpenAI client initialized successfully")
             except Exception as e:
@@ -43,54 +113,13 @@ class TranscriberService:
             logger.warning("OPENAI_API_KEY not found. Whisper transcription will not be available.")
             self.openai_client = None
         
-    def _check_ffmpeg_availability(self) -> bool:
-        """Check if ffmpeg is available on the system."""
-        try:
-            result = subprocess.run(
-                ["ffmpeg", "-version"], 
-                capture_output=True, 
-                text=True, 
-                check=True,
-                timeout=10
-            )
-            logger.info("ffmpeg is available")
-            return True
-        except (FileNotFoundError, subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
-            logger.warning(f"ffmpeg not found or not working: {e}")
-            return False
-    
-    def _check_yt_dlp_availability(self) -> bool:
-        """Check if yt-dlp is available on the system."""
-        try:
-            result = subprocess.run(
-                ["yt-dlp", "--version"], 
-                capture_output=True, 
-                text=True, 
-                check=True,
-                timeout=10
-            )
-            logger.info("yt-dlp is available")
-            return True
-        except (FileNotFoundError, subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
-            logger.warning(f"yt-dlp not found or not working: {e}")
-            return False
-        
     def _extract_video_id(self, youtube_url: str) -> Optional[str]:
         """Extract video ID from various YouTube URL formats."""
-        patterns = [
-            r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([^&\n?#]+)',
-            r'youtube\.com\/watch\?.*v=([^&\n?#]+)',
-            r'youtube\.com\/v\/([^&\n?#]+)',
-            r'youtube\.com\/shorts\/([^&\n?#]+)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, youtube_url)
-            if match:
-                video_id = match.group(1)
-                # Clean up video ID (remove any extra parameters)
-                video_id = re.sub(r'[^a-zA-Z0-9_-].*', '', video_id)
-                return video_id
+        # Every supported form contains "youtu"; the substring check turns
+        # other URLs away without running the regex
+        match = _VIDEO_ID_RE.search(youtube_url) if "youtu" in youtube_url else None
+        if match:
+            return match.group(1)
                 
         logger.warning(f"Could not extract video ID from URL: {youtube_url}")
         return None
@@ -109,6 +138,11 @@ class TranscriberService:
             if not video_id:
                 raise ValueError("Invalid YouTube URL format")
 
+            cached = self._transcript_cache.get(video_id)
+            if cached is not None:
+                logger.info(f"Using cached transcript for video ID: {video_id}")
+                return cached
+
             logger.info(f"Attempting to fetch transcript for video ID: {video_id}")
             
             # Method 1: Try to get existing captions/subtitles
@@ -116,7 +150,9 @@ class TranscriberService:
                 transcript_text = await self._get_youtube_captions(video_id)
                 if transcript_text and len(transcript_text.strip()) > 50:  # Ensure meaningful content
                     logger.info(f"Successfully fetched captions for video ID: {video_id}")
-                    return transcript_text.strip()
+                    transcript_text = transcript_text.strip()
+                    self._transcript_cache.set(video_id, transcript_text)
+                    return transcript_text
                 else:
                     logger.info("Captions found but content is too short, trying audio extraction")
             except (NoTranscriptFound, TranscriptsDisabled, ParseError) as e:
@@ -132,7 +168,9 @@ class TranscriberService:
             if not self.openai_client:
                 raise Exception("No captions available and OpenAI API is not configured. Please set OPENAI_API_KEY environment variable.")
             
-            return await self._extract_audio_and_transcribe_with_whisper(youtube_url, video_id)
+            transcript_text = await self._extract_audio_and_transcribe_with_whisper(youtube_url, video_id)
+            self._transcript_cache.set(video_id, transcript_text)
+            return transcript_text
             
         except VideoUnavailable:
             logger.error(f"Video is unavailable or private: {youtube_url}")
@@ -143,9 +181,21 @@ class TranscriberService:
 
     async def _get_youtube_captions(self, video_id: str) -> str:
         """Get captions from YouTube using youtube-transcript-api."""
+        # youtube-transcript-api does blocking HTTP requests, so run it in a
+        # worker thread rather than stalling the event loop
+        transcript_list = await asyncio.to_thread(self._fetch_youtube_captions, video_id)
+        
+        if not transcript_list:
+            raise NoTranscriptFound(video_id)
+            
+        # Combine all transcript segments
+        return " ".join(_iter_transcript_text(transcript_list))
+
+    def _fetch_youtube_captions(self, video_id: str) -> list:
+        """Fetch caption segments, preferring English (blocking)."""
         try:
             # Try to get transcript in English first, then any available language
-            transcript_list = YouTubeTranscriptApi.get_transcript(
+            return YouTubeTranscriptApi.get_transcript(
                 video_id, 
                 languages=['en', 'en-US', 'en-GB']
             )
@@ -154,48 +204,56 @@ class TranscriberService:
             try:
                 available_transcripts = YouTubeTranscriptApi.list_transcripts(video_id)
                 transcript = next(iter(available_transcripts))
-                transcript_list = transcript.fetch()
+                return transcript.fetch()
             except Exception:
                 raise NoTranscriptFound(video_id)
-        
-        if not transcript_list:
-            raise NoTranscriptFound(video_id)
-            
-        # Combine all transcript segments
-        transcript_text = " ".join([item.get('text', '') for item in transcript_list])
-        return transcript_text
 
     async def _extract_audio_and_transcribe_with_whisper(self, youtube_url: str, video_id: str) -> str:
         """Extract audio from YouTube video and transcribe using OpenAI Whisper."""
+        # Only reachable once the client exists, so the SDK is already loaded
+        from openai import APIConnectionError, RateLimitError, APIStatusError
+
         try:
             with tempfile.TemporaryDirectory() as temp_dir:
                 audio_path = Path(temp_dir) / f"{video_id}.mp3"
                 
-                # Enhanced yt-dlp command for better audio extraction
-                cmd = [
-                    "yt-dlp",
-                    "--extract-audio",
-                    "--audio-format", "mp3",
-                    "--audio-quality", "0",  # Best quality
-                    "--no-playlist",
-                    "--no-warnings",
-                    "--user-agent", "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                    "--output", str(audio_path.with_suffix('.%(ext)s')),
-                    youtube_url
-                ]
+                # Enhanced yt-dlp options for better audio extraction
+                ydl_opts = {
+                    "format": "bestaudio/best",
+                    "postprocessors": [{
+                        "key": "FFmpegExtractAudio",
+                        "preferredcodec": "mp3",
+                        "preferredquality": "0",  # Best quality
+                    }],
+                    "noplaylist": True,
+                    "quiet": True,
+                    "no_warnings": True,
+                    "socket_timeout": YT_DLP_SOCKET_TIMEOUT_SECONDS,
+                    "max_filesize": AUDIO_MAX_FILESIZE_BYTES,
+                    "http_headers": {"User-Agent": YT_DLP_USER_AGENT},
+                    "outtmpl": str(audio_path.with_suffix('.%(ext)s')),
+                }
                 
                 logger.info(f"Extracting audio from: {youtube_url}")
-                result = subprocess.run(
-                    cmd, 
-                    capture_output=True, 
-                    text=True, 
-                    timeout=300,  # 5 minutes timeout
-                    cwd=temp_dir
-                )
-                
-                if result.returncode != 0:
-                    logger.error(f"yt-dlp stderr: {result.stderr}")
-                    raise Exception(f"Failed to extract audio. yt-dlp error: {result.stderr}")
+                # yt-dlp downloads and converts synchronously; run it on the
+                # download pool so the event loop keeps serving requests. A
+                # thread can't be killed, so on timeout or cancellation the
+                # cancel event makes yt-dlp abort at its next progress update
+                # or before post-processing starts.
+                cancel_event = threading.Event()
+                loop = asyncio.get_running_loop()
+                try:
+                    await asyncio.wait_for(
+                        loop.run_in_executor(
+                            _audio_download_executor, _download_audio, youtube_url, ydl_opts, cancel_event
+                        ),
+                        timeout=AUDIO_DOWNLOAD_TIMEOUT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    logger.error("Audio extraction timed out")
+                    raise Exception("Audio extraction timed out. The video might be too long or unavailable.")
+                finally:
+                    cancel_event.set()
 
                 # Find the actual audio file (yt-dlp might change the filename)
                 audio_files = list(Path(temp_dir).glob("*.mp3"))
@@ -207,24 +265,22 @@ class TranscriberService:
                 
                 logger.info(f"Audio extracted successfully. File size: {file_size / (1024*1024):.2f} MB")
                 
-                # Check file size limit (OpenAI has a 25MB limit)
-                if file_size > 25 * 1024 * 1024:  # 25MB
-                    logger.warning("Audio file is larger than 25MB, compressing...")
-                    actual_audio_path = await self._compress_audio(actual_audio_path, temp_dir)
+                # Long audio is split into segments that are transcribed
+                # concurrently, each well under OpenAI's 25MB upload limit
+                segment_paths = await self._split_audio(actual_audio_path, temp_dir)
                 
                 # Transcribe with Whisper
-                logger.info("Starting Whisper transcription...")
+                logger.info(f"Starting Whisper transcription of {len(segment_paths)} segment(s)...")
                 
-                with open(actual_audio_path, "rb") as audio_file:
-                    transcription = self.openai_client.audio.transcriptions.create(
-                        model="whisper-1",
-                        file=audio_file,
-                        response_format="json",
-                        language="en",  # Force English for better accuracy
-                        prompt="This is a YouTube video transcript. Please transcribe accurately with proper punctuation."
-                    )
+                segment_texts = await asyncio.gather(
+                    *(self._transcribe_audio_file(path, temp_dir) for path in segment_paths),
+                    return_exceptions=True
+                )
+                for segment_text in segment_texts:
+                    if isinstance(segment_text, Exception):
+                        raise segment_text
                 
-                transcript_text = transcription.text
+                transcript_text = " ".join(text for text in segment_texts if text)
                 if not transcript_text or len(transcript_text.strip()) < 10:
                     raise Exception("Whisper API returned empty or very short transcript")
                 
@@ -245,13 +301,62 @@ class TranscriberService:
                 raise Exception("OpenAI API rate limit exceeded. Please try again later.")
             else:
                 raise Exception(f"OpenAI API error: {e.status_code} - {e.response}")
-        except subprocess.TimeoutExpired:
-            logger.error("Audio extraction timed out")
-            raise Exception("Audio extraction timed out. The video might be too long or unavailable.")
         except Exception as e:
             logger.error(f"Audio extraction/transcription error: {str(e)}", exc_info=True)
             raise Exception(f"Failed to transcribe audio: {str(e)}")
 
+    async def _transcribe_audio_file(self, audio_path: Path, temp_dir: str) -> str:
+        """Transcribe one audio file with Whisper, compressing it first if it's too large."""
+        # Check file size limit (OpenAI has a 25MB limit)
+        if audio_path.stat().st_size > 25 * 1024 * 1024:  # 25MB
+            logger.warning(f"{audio_path.name} is larger than 25MB, compressing...")
+            audio_path = await self._compress_audio(audio_path, temp_dir)
+
+        with open(audio_path, "rb") as audio_file:
+            transcription = await self._openai_limiter.call(
+                self.openai_client.audio.transcriptions.create,
+                model="whisper-1",
+                file=audio_file,
+                response_format="json",
+                language="en",  # Force English for better accuracy
+                prompt=WHISPER_PROMPT
+            )
+
+        return (transcription.text or "").strip()
+
+    async def _split_audio(self, audio_path: Path, temp_dir: str) -> List[Path]:
+        """
+        Split audio into AUDIO_SEGMENT_SECONDS-long files, in playback order.
+
+        Falls back to the whole file if ffmpeg can't split it.
+        """
+        segment_dir = Path(temp_dir) / "segments"
+        segment_dir.mkdir()
+
+        try:
+            cmd = [
+                "ffmpeg",
+                "-i", str(audio_path),
+                "-f", "segment",
+                "-segment_time", str(AUDIO_SEGMENT_SECONDS),
+                "-c", "copy",  # No re-encoding, just cut at frame boundaries
+                str(segment_dir / "segment_%03d.mp3")
+            ]
+
+            returncode, stderr = await _run_command(cmd, timeout=120)
+            if returncode != 0:
+                raise Exception(f"ffmpeg exited with code {returncode}: {stderr}")
+
+            segment_paths = sorted(segment_dir.glob("segment_*.mp3"))
+            if not segment_paths:
+                raise FileNotFoundError("ffmpeg produced no segments")
+
+            return segment_paths
+
+        except Exception as e:
+            logger.warning(f"Audio splitting failed: {e}. Transcribing the whole file.")
+            return [audio_path]
+
     async def _compress_audio(self, audio_path: Path, temp_dir: str) -> Path:
         """Compress audio file to reduce size for OpenAI API."""
         compressed_path = Path(temp_dir) / f"compressed_{audio_path.name}"
@@ -267,13 +372,9 @@ class TranscriberService:
                 str(compressed_path)
             ]
             
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=120,
-                check=True
-            )
+            returncode, stderr = await _run_command(cmd, timeout=120)
+            if returncode != 0:
+                raise Exception(f"ffmpeg exited with code {returncode}: {stderr}")
             
             new_size = compressed_path.stat().st_size
             logger.info(f"Audio compressed. New size: {new_size / (1024*1024):.2f} MB")
@@ -291,9 +392,66 @@ class TranscriberService:
             "whisper_transcription": self.openai_client is not None,
             "ffmpeg_available": self._ffmpeg_available,
             "yt_dlp_available": self._yt_dlp_available,
-            "requirements": {
-                "ffmpeg": "Required for audio extraction",
-                "yt-dlp": "Required for YouTube audio download", 
-                "openai_api_key": "Required for Whisper transcription"
-            }
-        }
\ No newline at end of file
+            "requirements": TOOL_REQUIREMENTS
+        }
+
+
+def _download_audio(youtube_url: str, ydl_opts: dict, cancel_event: threading.Event) -> None:
+    """
+    Download a video's audio track with the yt_dlp API (blocking).
+
+    Videos longer than AUDIO_MAX_DURATION_SECONDS are refused before anything
+    is downloaded, and the download stops once cancel_event is set.
+    """
+    from yt_dlp import YoutubeDL
+    from yt_dlp.utils import DownloadError
+
+    def _check_cancelled(_progress: dict) -> None:
+        if cancel_event.is_set():
+            raise DownloadError("Download cancelled")
+
+    try:
+        hooks = {"progress_hooks": [_check_cancelled], "postprocessor_hooks": [_check_cancelled]}
+        with YoutubeDL({**ydl_opts, **hooks}) as ydl:
+            info = ydl.extract_info(youtube_url, download=False)
+            duration = info.get("duration") or 0
+            if duration > AUDIO_MAX_DURATION_SECONDS:
+                raise Exception(
+                    f"Video is too long for audio transcription ({duration // 60} minutes, "
+                    f"limit {AUDIO_MAX_DURATION_SECONDS // 60})."
+                )
+            # Reuses the extracted info instead of fetching the page again
+            ydl.process_ie_result(info, download=True)
+    except DownloadError as e:
+        logger.error(f"yt-dlp error: {e}")
+        raise Exception(f"Failed to extract audio. yt-dlp error: {e}")
+
+
+def _iter_transcript_text(transcript_list: list):
+    """Yield the text of each caption segment, skipping empty ones."""
+    for item in transcript_list:
+        text = item.get('text', '')
+        if text:
+            yield text
+
+
+async def _run_command(cmd: list, timeout: float):
+    """
+    Run a command without blocking the event loop, returning (returncode, stderr).
+
+    Raises subprocess.TimeoutExpired (after killing the process) if it runs
+    longer than timeout seconds.
+    """
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        _, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise subprocess.TimeoutExpired(cmd, timeout)
+
+    return process.returncode, stderr.decode(errors="replace")
@@ -0,0 +1,205 @@
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import orjson
+
+
+class LRUCache:
+    """
+    Small in-process LRU cache with an optional per-entry time-to-live.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default on a miss or expired entry."""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the least recently used entry when full."""
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class PriorityCache:
+    """
+    In-process cache bounded by the total size of its entries, with LRBU eviction.
+
+    When full, the entry with the lowest hits / (size * (seconds since last
+    hit + 1)) is evicted first, so large, rarely and long-ago used entries go
+    before small, popular or recent ones.
+    """
+
+    def __init__(self, max_size: int, sizeof: Callable[[Any], int], ttl: Optional[float] = None):
+        self.max_size = max_size
+        self.sizeof = sizeof
+        self.ttl = ttl
+        self._data: Dict[Hashable, list] = {}
+        self._total_size = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default on a miss or expired entry."""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+
+        now = time.monotonic()
+        value, expires_at, hits, last_hit, size = entry
+        if expires_at is not None and expires_at <= now:
+            self._remove(key)
+            return default
+
+        entry[2] = hits + 1
+        entry[3] = now
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store value under key, evicting the lowest-priority entries while over max_size.
+
+        A value larger than max_size on its own is not cached.
+        """
+        if key in self._data:
+            self._remove(key)
+
+        size = max(1, self.sizeof(value))
+        if size > self.max_size:
+            # Would evict everything else and still not fit
+            return
+
+        now = time.monotonic()
+        expires_at = now + self.ttl if self.ttl is not None else None
+        self._data[key] = [value, expires_at, 1, now, size]
+        self._total_size += size
+
+        while self._total_size > self.max_size:
+            self._remove(self._eviction_candidate(now, exclude=key))
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        self._data.clear()
+        self._total_size = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _eviction_candidate(self, now: float, exclude: Hashable) -> Hashable:
+        """Return an expired entry's key if there is one, else the lowest-scoring key."""
+        candidate = None
+        lowest_score = None
+        for key, (_, expires_at, hits, last_hit, size) in self._data.items():
+            if key == exclude:
+                continue
+            if expires_at is not None and expires_at <= now:
+                return key
+            score = hits / (size * (now - last_hit + 1))
+            if lowest_score is None or score < lowest_score:
+                candidate, lowest_score = key, score
+        return candidate
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._data.pop(key)
+        self._total_size -= entry[4]
+
+
+class SqliteCache:
+    """
+    String-keyed cache persisted in a SQLite database, so entries survive restarts.
+
+    Each set only writes its own rows, so several worker processes can share
+    one file without overwriting each other's entries (WAL mode lets readers
+    and a writer proceed together). Expired entries are deleted on write, and
+    max_entries bounds the table by dropping the oldest writes first. Values
+    must be JSON-serializable. Methods block on disk I/O; call them from a
+    worker thread in async code.
+    """
+
+    def __init__(self, path, ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the stored value for key, or default on a miss or expired entry."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return default
+
+        value, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            return default
+        return orjson.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value under key."""
+        self.set_many({key: value})
+
+    def set_many(self, items: Dict[str, Any]) -> None:
+        """Store several JSON-serializable values in a single transaction."""
+        # Wall-clock time, since entries outlive the process
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl is not None else None
+        rows = [(key, orjson.dumps(value), expires_at, now) for key, value in items.items()]
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO cache (key, value, expires_at, stored_at) VALUES (?, ?, ?, ?)",
+                    rows
+                )
+                conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+                if self.max_entries is not None:
+                    conn.execute(
+                        "DELETE FROM cache WHERE key IN "
+                        "(SELECT key FROM cache ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                        (self.max_entries,)
+                    )
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Shared across the worker threads calls arrive on; self._lock
+            # serializes them
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL, stored_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (expires_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_stored_at ON cache (stored_at)")
+            self._conn = conn
+        return self._conn
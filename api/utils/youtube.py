@@ -1,13 +1,98 @@
-import httpx
 import re
+import asyncio
 import logging
-from typing import Optional
+from typing import Dict, List, NamedTuple, Optional
 from models.schemas import VideoMetadata
-from datetime import datetime, timedelta
+from services.http_pool import get_http_client
+from utils.cache import PriorityCache, SqliteCache
+from datetime import datetime, timedelta, timezone
 import os
+import sys
+from functools import lru_cache
+import orjson
 
 logger = logging.getLogger(__name__)
 
+YOUTUBE_API_TIMEOUT_SECONDS = 10.0
+
+# videos.list accepts at most this many comma-separated IDs per call
+MAX_VIDEO_IDS_PER_REQUEST = 50
+
+# Maximum number of YouTube API requests in flight per worker; bulk lookups
+# queue here instead of opening a burst of connections
+YOUTUBE_API_CONCURRENCY = int(os.getenv("YOUTUBE_API_CONCURRENCY", "10"))
+
+# Recently fetched video metadata, keyed by video ID. Bounded by the
+# approximate size of the entries (in characters) rather than their count,
+# since titles and URLs vary in length. View and like counts drift, so
+# entries expire after an hour.
+METADATA_CACHE_MAX_SIZE = 4 * 1024 * 1024
+METADATA_CACHE_TTL_SECONDS = 3600
+
+# Descriptions run up to 5000 characters but nothing downstream reads past
+# the opening lines, so only this much is kept
+DESCRIPTION_MAX_CHARS = 256
+
+# Metadata is also persisted here, so it stays warm across restarts and
+# saves API quota on cold starts; set METADATA_CACHE_PATH to an empty string
+# to disable. Entries on disk are kept for a day, trading some staleness in
+# the counts for fewer API calls. The database is shared by all workers.
+METADATA_CACHE_PATH = os.getenv("METADATA_CACHE_PATH", "data/youtube_metadata.sqlite3")
+METADATA_DISK_CACHE_TTL_SECONDS = 24 * 3600
+METADATA_DISK_CACHE_MAX_ENTRIES = 100000
+
+# Rough per-entry cost of the fixed fields (counts, dates, object overhead)
+_METADATA_BASE_SIZE = 256
+
+# Video ID in watch (v= first or later in the query), youtu.be and embed URLs.
+# One compiled alternation, so a URL is scanned once whichever form it takes;
+# the lazy (?:.*?&)?? prefers a leading v= and otherwise takes the first &v=.
+_VIDEO_ID_RE = re.compile(
+    r'(?:youtube\.com/watch\?(?:.*?&)??v=|youtu\.be/|youtube\.com/embed/)([^&\n?#]+)'
+)
+
+# Longer strings can't be a URL we accept; they are rejected before reaching
+# the memo, which would otherwise pin arbitrarily large request bodies
+MAX_YOUTUBE_URL_LENGTH = 2048
+
+def _extract_video_id(youtube_url: str) -> Optional[str]:
+    """
+    Extract the video ID from a YouTube URL, memoized.
+
+    The same URL is looked up several times per request (cache key, metadata,
+    validation), and repeat analyses of a video send the same URL again.
+    """
+    if len(youtube_url) > MAX_YOUTUBE_URL_LENGTH:
+        return None
+    return _extract_video_id_cached(youtube_url)
+
+@lru_cache(maxsize=4096)
+def _extract_video_id_cached(youtube_url: str) -> Optional[str]:
+    # Every supported form contains "youtu", and a substring check rejects
+    # other URLs faster than a failed regex scan
+    if "youtu" not in youtube_url:
+        return None
+    
+    match = _VIDEO_ID_RE.search(youtube_url)
+    return match.group(1) if match else None
+
+class _CachedMetadata(NamedTuple):
+    """
+    Compact form of VideoMetadata kept in the metadata cache.
+
+    A plain tuple of the field values is several times smaller than a
+    pydantic instance, which carries an instance __dict__ and a fields-set
+    set on top of the values.
+    """
+    title: str
+    duration: int
+    thumbnail_url: str
+    channel_name: str
+    view_count: Optional[int]
+    like_count: Optional[int]
+    published_at: Optional[datetime]
+    description: Optional[str]
+
 class YouTubeUtils:
     """
     Utility class for YouTube-related operations.
@@ -16,22 +101,32 @@ class YouTubeUtils:
     def __init__(self):
         self.youtube_api_key = os.getenv("YOUTUBE_API_KEY")
         self.base_url = "https://www.googleapis.com/youtube/v3"
+        # Invariant parts of every videos.list request, built once
+        self._videos_url = f"{self.base_url}/videos"
+        self._videos_base_params = (
+            ("part", "snippet,statistics,contentDetails"),
+            ("key", self.youtube_api_key),
+        )
+        self._api_semaphore = asyncio.Semaphore(YOUTUBE_API_CONCURRENCY)
+        self._metadata_cache = PriorityCache(
+            max_size=METADATA_CACHE_MAX_SIZE,
+            sizeof=_metadata_size,
+            ttl=METADATA_CACHE_TTL_SECONDS
+        )
+        self._disk_cache = (
+            SqliteCache(
+                METADATA_CACHE_PATH,
+                ttl=METADATA_DISK_CACHE_TTL_SECONDS,
+                max_entries=METADATA_DISK_CACHE_MAX_ENTRIES
+            )
+            if METADATA_CACHE_PATH else None
+        )
         
     def extract_video_id(self, youtube_url: str) -> Optional[str]:
         """
         Extract video ID from YouTube URL.
         """
-        patterns = [
-            r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([^&\n?#]+)',
-            r'youtube\.com\/watch\?.*v=([^&\n?#]+)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, youtube_url)
-            if match:
-                return match.group(1)
-        
-        return None
+        return _extract_video_id(youtube_url)
     
     async def get_video_metadata(self, youtube_url: str) -> Optional[VideoMetadata]:
         """
@@ -42,6 +137,11 @@ class YouTubeUtils:
             logger.error(f"Invalid YouTube URL: {youtube_url}")
             return None
         
+        cached = await self._get_cached_metadata(video_id)
+        if cached is not None:
+            logger.info(f"Using cached metadata for video ID: {video_id}")
+            return cached
+        
         logger.info(f"Getting metadata for video ID: {video_id}")
         
         if not self.youtube_api_key:
@@ -49,48 +149,187 @@ class YouTubeUtils:
             raise Exception("YouTube API key is not configured on the server.")
         
         try:
-            return await self._fetch_from_youtube_api(video_id)
+            metadata = await self._fetch_from_youtube_api(video_id)
         except Exception as e:
             logger.error(f"Error getting video metadata: {str(e)}")
             return None
+        
+        # Misses aren't cached, so a video that becomes available is picked up
+        if metadata is not None:
+            await self._cache_metadata({video_id: metadata})
+        return metadata
     
-    async def _fetch_from_youtube_api(self, video_id: str) -> Optional[VideoMetadata]:
+    def clear_cache(self) -> None:
+        """Drop all in-memory video metadata; the disk cache is left alone."""
+        self._metadata_cache.clear()
+    
+    async def get_many_video_metadata(self, youtube_urls: List[str]) -> Dict[str, VideoMetadata]:
         """
-        Fetch video metadata from YouTube Data API v3.
+        Get metadata for several videos, batching uncached ones into as few API calls as possible.
+
+        Returns a dict keyed by video ID. Invalid URLs and videos that can't be
+        found are left out.
         """
-        async with httpx.AsyncClient() as client:
-            url = f"{self.base_url}/videos"
-            params = {
-                "part": "snippet,statistics,contentDetails",
-                "id": video_id,
-                "key": self.youtube_api_key
-            }
-            
-            response = await client.get(url, params=params)
-            response.raise_for_status()
+        video_ids = []
+        for youtube_url in youtube_urls:
+            video_id = self.extract_video_id(youtube_url)
+            if video_id:
+                video_ids.append(video_id)
+            else:
+                logger.warning(f"Invalid YouTube URL: {youtube_url}")
+        
+        metadata_by_id = {}
+        missing_ids = []
+        for video_id in dict.fromkeys(video_ids):  # Deduplicated, order kept
+            cached = await self._get_cached_metadata(video_id)
+            if cached is not None:
+                metadata_by_id[video_id] = cached
+            else:
+                missing_ids.append(video_id)
+        
+        if missing_ids:
+            if not self.youtube_api_key:
+                logger.error("YOUTUBE_API_KEY environment variable not set.")
+                raise Exception("YouTube API key is not configured on the server.")
             
-            data = response.json()
-            if not data.get("items"):
-                logger.warning(f"No video data found for ID: {video_id}")
+            fetched = await self._fetch_many_from_youtube_api(missing_ids)
+            await self._cache_metadata(fetched)
+            metadata_by_id.update(fetched)
+        
+        return metadata_by_id
+    
+    async def _get_cached_metadata(self, video_id: str) -> Optional[VideoMetadata]:
+        """Look metadata up in memory, then on disk; None on a miss."""
+        cached = self._metadata_cache.get(video_id)
+        if cached is None and self._disk_cache is not None:
+            try:
+                values = await asyncio.to_thread(self._disk_cache.get, video_id)
+                if values is not None:
+                    cached = _CachedMetadata(*values)
+                    if cached.published_at is not None:
+                        cached = cached._replace(published_at=_parse_timestamp(cached.published_at))
+            except Exception as e:
+                logger.warning(f"Failed to read YouTube metadata cache: {e}")
                 return None
-            
-            item = data["items"][0]
-            snippet = item["snippet"]
-            statistics = item.get("statistics", {})
-            content_details = item["contentDetails"]
-            
-            duration_seconds = self._parse_duration(content_details.get("duration", "PT0S"))
-            
-            return VideoMetadata(
-                title=snippet.get("title", "No Title"),
-                duration=duration_seconds,
-                thumbnail_url=snippet.get("thumbnails", {}).get("high", {}).get("url"),
-                channel_name=snippet.get("channelTitle", "Unknown Channel"),
-                view_count=int(statistics.get("viewCount", 0)),
-                like_count=int(statistics.get("likeCount", 0)),
-                published_at=datetime.fromisoformat(snippet["publishedAt"].replace("Z", "+00:00")),
-                description=snippet.get("description", "")
+            if cached is not None:
+                self._metadata_cache.set(video_id, cached)
+        if cached is None:
+            return None
+        # The values were validated when the entry was stored
+        return VideoMetadata.model_construct(**cached._asdict())
+    
+    async def _cache_metadata(self, metadata_by_id: Dict[str, VideoMetadata]) -> None:
+        """Store metadata in memory in its compact tuple form and on disk; a failed disk write is only logged."""
+        if not metadata_by_id:
+            return
+        
+        entries = {
+            video_id: _CachedMetadata(
+                metadata.title,
+                metadata.duration,
+                metadata.thumbnail_url,
+                metadata.channel_name,
+                metadata.view_count,
+                metadata.like_count,
+                metadata.published_at,
+                metadata.description
             )
+            for video_id, metadata in metadata_by_id.items()
+        }
+        for video_id, entry in entries.items():
+            self._metadata_cache.set(video_id, entry)
+        
+        if self._disk_cache is not None:
+            # One transaction per batch; orjson writes published_at as ISO 8601
+            disk_entries = {video_id: list(entry) for video_id, entry in entries.items()}
+            try:
+                await asyncio.to_thread(self._disk_cache.set_many, disk_entries)
+            except Exception as e:
+                logger.warning(f"Failed to persist YouTube metadata cache: {e}")
+    
+    async def _fetch_from_youtube_api(self, video_id: str) -> Optional[VideoMetadata]:
+        """
+        Fetch video metadata from YouTube Data API v3.
+        """
+        metadata = (await self._fetch_video_batch([video_id])).get(video_id)
+        if metadata is None:
+            logger.warning(f"No video data found for ID: {video_id}")
+        return metadata
+    
+    async def _fetch_many_from_youtube_api(self, video_ids: List[str]) -> Dict[str, VideoMetadata]:
+        """
+        Fetch metadata for any number of videos, MAX_VIDEO_IDS_PER_REQUEST per API call, concurrently.
+
+        A batch that fails is logged and left out of the result.
+        """
+        batches = [
+            video_ids[i:i + MAX_VIDEO_IDS_PER_REQUEST]
+            for i in range(0, len(video_ids), MAX_VIDEO_IDS_PER_REQUEST)
+        ]
+        results = await asyncio.gather(
+            *(self._fetch_video_batch(batch) for batch in batches),
+            return_exceptions=True
+        )
+        
+        metadata_by_id = {}
+        for batch, result in zip(batches, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error getting metadata for {len(batch)} videos: {result}")
+                continue
+            metadata_by_id.update(result)
+        return metadata_by_id
+    
+    async def _fetch_video_batch(self, video_ids: List[str]) -> Dict[str, VideoMetadata]:
+        """
+        Fetch metadata for up to MAX_VIDEO_IDS_PER_REQUEST videos in one YouTube Data API v3 call.
+        """
+        # The pooled client keeps the connection to googleapis.com alive
+        # between requests instead of reconnecting for every video
+        client = get_http_client()
+        params = [*self._videos_base_params, ("id", ",".join(video_ids))]
+        
+        async with self._api_semaphore:
+            response = await client.get(self._videos_url, params=params, timeout=YOUTUBE_API_TIMEOUT_SECONDS)
+        response.raise_for_status()
+        
+        # orjson decodes the raw bytes directly, without decoding to str first
+        data = orjson.loads(response.content)
+        metadata_by_id = {}
+        for item in data.get("items", []):
+            # One malformed item (e.g. no high-resolution thumbnail) only
+            # costs its own video, not the rest of the batch
+            try:
+                metadata_by_id[item["id"]] = self._video_metadata_from_item(item)
+            except Exception as e:
+                logger.warning(f"Skipping unparseable metadata for video ID {item.get('id')}: {e}")
+        return metadata_by_id
+    
+    def _video_metadata_from_item(self, item: dict) -> VideoMetadata:
+        """Build VideoMetadata from one item of a videos.list response."""
+        snippet = item["snippet"]
+        statistics = item.get("statistics", {})
+        content_details = item["contentDetails"]
+        
+        fields = dict(
+            title=snippet.get("title", "No Title"),
+            duration=self._parse_duration(content_details.get("duration", "PT0S")),
+            thumbnail_url=snippet.get("thumbnails", {}).get("high", {}).get("url"),
+            channel_name=snippet.get("channelTitle", "Unknown Channel"),
+            view_count=int(statistics.get("viewCount", 0)),
+            like_count=int(statistics.get("likeCount", 0)),
+            published_at=_parse_timestamp(snippet["publishedAt"]),
+            # Truncated here rather than only in the cache, so cached and
+            # fresh responses carry the same description
+            description=snippet.get("description", "")[:DESCRIPTION_MAX_CHARS]
+        )
+        
+        # Every value above already has its field's type, so validation would
+        # only re-check it, once per item of a 50-video batch. The one value
+        # that can be missing goes through the validating constructor, which
+        # rejects it as before.
+        if fields["thumbnail_url"] is None:
+            return VideoMetadata(**fields)
+        return VideoMetadata.model_construct(**fields)
     
     def _parse_duration(self, duration_str: str) -> int:
         """
@@ -98,23 +337,61 @@ class YouTubeUtils:
         """
         if not duration_str.startswith('PT'):
             return 0
-            
-        duration_str = duration_str[2:]
-        total_seconds = 0
-        
-        time_matches = re.match(r'(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?', duration_str)
-        if not time_matches:
-            return 0
 
-        hours = int(time_matches.group(1)) if time_matches.group(1) else 0
-        minutes = int(time_matches.group(2)) if time_matches.group(2) else 0
-        seconds = int(time_matches.group(3)) if time_matches.group(3) else 0
+        # A single pass over the (short) string is cheaper than a regex match
+        # plus group extraction and int() conversions
+        total_seconds = 0
+        value = 0
+        for char in duration_str[2:]:
+            if '0' <= char <= '9':
+                value = value * 10 + ord(char) - 48
+            elif char == 'H':
+                total_seconds += value * 3600
+                value = 0
+            elif char == 'M':
+                total_seconds += value * 60
+                value = 0
+            elif char == 'S':
+                total_seconds += value
+                value = 0
+            else:
+                break  # Fractional seconds or anything unexpected ends the parse
         
-        total_seconds = hours * 3600 + minutes * 60 + seconds
         return total_seconds
     
     def is_valid_youtube_url(self, url: str) -> bool:
         """
         Check if URL is a valid YouTube URL.
+
+        Shares the memoized extraction, so validating and then extracting the
+        same URL only parses it once. Callers that need the ID should call
+        extract_video_id and check for None instead.
         """
-        return self.extract_video_id(url) is not None
\ No newline at end of file
+        return _extract_video_id(url) is not None
+
+
+if sys.version_info >= (3, 11):
+    # fromisoformat accepts the trailing "Z" YouTube uses from 3.11 on
+    _parse_timestamp = datetime.fromisoformat
+else:
+    def _parse_timestamp(value: str) -> datetime:
+        """Parse a YouTube API timestamp such as "2023-01-15T10:30:00Z"."""
+        if len(value) == 20 and value[19] == "Z":
+            # Fixed layout, so slicing beats the general ISO parser
+            return datetime(
+                int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                int(value[11:13]), int(value[14:16]), int(value[17:19]),
+                tzinfo=timezone.utc
+            )
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _metadata_size(metadata: _CachedMetadata) -> int:
+    """Approximate memory cost of a cached metadata entry, in characters."""
+    return (
+        _METADATA_BASE_SIZE
+        + len(metadata.title)
+        + len(metadata.channel_name or "")
+        + len(metadata.thumbnail_url or "")
+        + len(metadata.description or "")
+    )